@@ -30,27 +30,87 @@ except (ImportError, AttributeError):
     pass
 # ==============================
 
+from collections import OrderedDict, defaultdict
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI, HTTPException, Request, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, field_validator
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator, model_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, TextIteratorStreamer
 from pathlib import Path
+import asyncio
+import atexit
+import copy
+import gc
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+import threading
 import time
 import argparse
 import json
+import re
 import uuid
-from datetime import datetime
-from typing import Optional, List
+import yaml  # Character card parsing (already a transformers dependency)
+# libyaml-backed loader when PyYAML was built with it (5-10x faster parse);
+# same safe-loading semantics either way
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, List, Union
 import requests  # For Tavily API and SMHI weather
 
+# Optional speedups for the non-GPU request path: uvloop replaces asyncio's
+# selector event loop (~2x request throughput) and orjson serializes JSON
+# 3-10x faster than stdlib json. Both are drop-in; the server runs without them.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# GPU inventory queries at startup: NVML reads names/memory from the driver
+# without creating a CUDA context on each device, so multi-GPU boxes skip
+# the per-device init stall. Falls back to torch.cuda when not installed.
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+# Heavy optional backends hoisted to process start: an inline import inside
+# load_model re-pays the sys.path walk and module init on every call (PEFT
+# alone pulls in large transformers subsystems), which adds up in dual-model
+# mode where load_model runs more than once.
+try:
+    from peft import PeftModel, PeftConfig, set_peft_model_state_dict
+except ImportError:
+    PeftModel = None
+    PeftConfig = None
+    set_peft_model_state_dict = None
+
+try:
+    from transformers import BitsAndBytesConfig
+except ImportError:
+    BitsAndBytesConfig = None
+
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
+
 # RSS feed parsing for news feature
 try:
     import feedparser
@@ -105,6 +165,15 @@ def load_force_swedish() -> List[str]:
 # Load triggers at startup - these can be updated via API
 FORCE_SVENSKA_TRIGGERS = load_force_swedish()
 
+# Fast-path Swedish detection: langdetect is a slow pure-Python n-gram
+# classifier (~5-20 ms per call). A compiled scan for common Swedish function
+# words over the first 200 characters settles obviously Swedish text in
+# microseconds; only ambiguous text falls through to langdetect.
+SWEDISH_MARKERS = re.compile(
+    r'\b(och|att|jag|för|inte|är|det|som|också|eller|vad|varför)\b',
+    re.IGNORECASE
+)
+
 
 def is_swedish(text: str) -> bool:
     """
@@ -127,11 +196,18 @@ def is_swedish(text: str) -> bool:
         return False
     
     text_preview = text[:50] + "..." if len(text) > 50 else text
-    
-    # Try langdetect first if available
+
+    # Fast path: unmistakable Swedish function words settle it without the
+    # n-gram classifier
+    if SWEDISH_MARKERS.search(text[:200]):
+        print(f"[FORCE-SVENSKA] ✅ marker fast path: '{text_preview}' → sv (Swedish)")
+        return True
+
+    # Try langdetect if available - 200 chars is plenty for the n-gram
+    # profile to converge, and caps the per-call cost on long responses
     if LANGDETECT_AVAILABLE:
         try:
-            detected_lang = detect(text)
+            detected_lang = detect(text[:200])
             # Accept Swedish and closely related Nordic languages
             # (langdetect often confuses short Swedish texts with Danish/Norwegian)
             if detected_lang in ("sv", "da", "no"):
@@ -540,7 +616,6 @@ def fetch_saol_data(query: str) -> Optional[str]:
             r'synonymer\s+till\s+(\w+)',
         ]
         
-        import re
         extracted_word = None
         for pattern in patterns:
             match = re.search(pattern, query, re.IGNORECASE)
@@ -1097,7 +1172,6 @@ def build_sources_section(
     
     # Tavily sources (already formatted with HTML, extract)
     if tavily_sources:
-        import re
         # Match <a href="url">title</a> pattern
         tavily_links = re.findall(r'<a href="([^"]+)">([^<]+)</a>', tavily_sources)
         for url, title in tavily_links:
@@ -1138,12 +1212,26 @@ parser.add_argument('--directml', action='store_true',
                     help='Force DirectML acceleration (Windows AMD/Intel GPU)')
 parser.add_argument('--use-direct', action='store_true',
                     help='Force direct device placement (fixes DirectML tensor issues)')
+parser.add_argument('--use-vllm', action='store_true',
+                    help='Serve inference through vLLM (continuous batching + PagedAttention, CUDA only)')
+parser.add_argument('--onnx-dml', action='store_true',
+                    help='Serve inference through ONNX Runtime with the DirectML execution provider '
+                         '(exports to ONNX once and caches it next to the weights; DirectML only)')
+parser.add_argument('--compile', action='store_true',
+                    help='Compile the model with torch.compile (inductor) and warm it up at startup '
+                         '(CUDA only, ~25%% faster decode; first load takes longer)')
+parser.add_argument('--cuda-graphs', action='store_true',
+                    help='Capture CUDA graphs for the decode step (CUDA only, lowest latency at batch=1)')
+parser.add_argument('--quantization', choices=['awq', 'gptq', 'none'], default='none',
+                    help='Weight-only quantization backend (AWQ/GPTQ, ~2x decode throughput on CUDA). '
+                         'For FP8 use --use-vllm with an FP8 checkpoint.')
 parser.add_argument('--load-in-4bit', action='store_true',
-                    help='Load model in 4-bit quantization for memory efficiency')
+                    help='Load model in 4-bit quantization for memory efficiency (bitsandbytes, prefer --quantization awq on CUDA)')
 parser.add_argument('--load-in-8bit', action='store_true',
-                    help='Load model in 8-bit quantization')
-parser.add_argument('--n-gpu-layers', type=int, default=40,
-                    help='Number of layers to offload to GPU (default: 40, use 99 for all layers)')
+                    help='Load model in 8-bit quantization (bitsandbytes, prefer --quantization gptq on CUDA)')
+parser.add_argument('--tensor-parallel', type=int, default=0,
+                    help='Tensor-parallel degree across CUDA GPUs for the vLLM backend '
+                         '(0 = all available GPUs, 1 = single GPU)')
 parser.add_argument('--gpu-memory', type=float, default=16.0,
                     help='GPU memory allocation in GB (default: 16.0)')
 parser.add_argument('--timeout-keep-alive', type=int, default=600,
@@ -1158,11 +1246,24 @@ args, unknown = parser.parse_known_args()
 # Use ONESEEK_DEBUG=1 environment variable for verbose debug output
 DEBUG_MODE = os.getenv('ONESEEK_DEBUG', '0') == '1'
 log_level = logging.DEBUG if DEBUG_MODE else logging.INFO
-logging.basicConfig(
-    level=log_level,
-    format='[%(asctime)s.%(msecs)03d] %(levelname)s %(message)s',
+
+# Logging goes through a queue: emitting a record on the inference path is
+# then just a lock-free put, and the QueueListener thread does the actual
+# formatting + stderr write. Without this, every logger call on the generate
+# path can block on terminal/pipe I/O.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter(
+    fmt='[%(asctime)s.%(msecs)03d] %(levelname)s %(message)s',
     datefmt='%H:%M:%S'
-)
+))
+_root_logger = logging.getLogger()
+_root_logger.setLevel(log_level)
+_root_logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 if DEBUG_MODE:
     logger.info("🔍 DEBUG MODE ENABLED - Verbose logging active")
@@ -1178,13 +1279,21 @@ def get_models_base_dir():
     """
     Get the base models directory, respecting MODELS_DIR environment variable.
     This allows for flexible deployment and testing scenarios.
-    
+
     Priority:
     1. MODELS_DIR environment variable (if set)
     2. PRODUCTION_MODELS_PATH environment variable (legacy support)
     3. PROJECT_ROOT/models (default)
+
+    Memoized per environment values - hot reload and worker forking re-run
+    this, and each exists() check can be ms-level on NFS/Windows shares.
     """
-    models_dir = os.getenv('MODELS_DIR')
+    return _resolve_models_base_dir(os.getenv('MODELS_DIR'), os.getenv('PRODUCTION_MODELS_PATH'))
+
+
+@lru_cache(maxsize=4)
+def _resolve_models_base_dir(models_dir, prod_models):
+    """Resolve the models base dir for one (MODELS_DIR, PRODUCTION_MODELS_PATH) pair"""
     if models_dir:
         models_path = Path(models_dir)
         if models_path.exists():
@@ -1195,7 +1304,6 @@ def get_models_base_dir():
             logger.warning("  Falling back to default location")
     
     # Legacy env var support
-    prod_models = os.getenv('PRODUCTION_MODELS_PATH')
     if prod_models:
         prod_path = Path(prod_models)
         if prod_path.exists():
@@ -1218,11 +1326,31 @@ def get_active_model_path():
     
     The certified symlink points to DNA-based directories like:
     models/oneseek-certified/OneSeek-7B-Zero.v1.0.sv.dsCivicID-SwedID.141521ad.90cdf6f1/
+
+    Memoized per (ONESEEK_MODEL_PATH, models base) - discovery stats every
+    certified candidate and should not re-run on hot reload.
     """
-    models_base = get_models_base_dir()
-    
+    return _resolve_active_model_path(os.getenv('ONESEEK_MODEL_PATH'), str(get_models_base_dir()))
+
+
+# Certified directory names encode their version up front
+# (OneSeek-7B-Zero.v1.2.sv.dsCivicID.141521ad.90cdf6f1) - sorting on the
+# parsed version avoids a stat() per candidate during auto-discovery
+_CERTIFIED_VER_RE = re.compile(r'OneSeek-7B-Zero\.v(\d+)\.(\d+)')
+
+
+def _model_path_cache_file(models_base: Path) -> Path:
+    """Location of the cross-process discovery cache (JSON: {path, mtime})"""
+    return Path(os.getenv('ONESEEK_MODEL_PATH_CACHE',
+                          str(models_base / 'oneseek-certified' / '.model_path_cache.json')))
+
+
+@lru_cache(maxsize=4)
+def _resolve_active_model_path(env_path, models_base_str):
+    """Resolve the active model path for one (ONESEEK_MODEL_PATH, models base) pair"""
+    models_base = Path(models_base_str)
+
     # Check environment variable first (manual override)
-    env_path = os.getenv('ONESEEK_MODEL_PATH')
     if env_path:
         env_path_obj = Path(env_path)
         if env_path_obj.exists():
@@ -1271,21 +1399,57 @@ def get_active_model_path():
     # Auto-discover latest certified model (fallback when no symlink/marker exists)
     certified_dir = models_base / 'oneseek-certified'
     if certified_dir.exists():
+        # Cross-process cache: a previous start already paid for the scan -
+        # reuse its answer while the certified dir itself is unchanged. The
+        # key is the PARENT directory's mtime: adding or removing a model
+        # directory bumps it on both POSIX and NTFS, so a newly trained
+        # certified model invalidates the cache and a fresh scan picks it up.
+        cache_file = _model_path_cache_file(models_base)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            cached_path = Path(cached['path'])
+            if cached_path.exists() and certified_dir.stat().st_mtime_ns == cached['dir_mtime_ns']:
+                logger.info(f"✓ Using cached certified model path: {cached_path.name}")
+                return str(cached_path)
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            pass
+
         try:
+            # Snapshot the dir mtime before scanning: a model added mid-scan
+            # then leaves a stale key behind, forcing a re-scan next start
+            dir_mtime_ns = certified_dir.stat().st_mtime_ns
             # Find all certified model directories (format: OneSeek-7B-Zero.v*.*)
+            # Keyed on the version parsed from the name - no stat() needed
             certified_models = []
-            for item in certified_dir.iterdir():
-                if item.is_dir() and item.name.startswith('OneSeek-7B-Zero.v'):
-                    # Check if it has metadata.json (valid trained model)
-                    if (item / 'metadata.json').exists():
-                        certified_models.append(item)
-            
+            with os.scandir(certified_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and entry.name.startswith('OneSeek-7B-Zero.v'):
+                        # Check if it has metadata.json (valid trained model)
+                        if (Path(entry.path) / 'metadata.json').exists():
+                            match = _CERTIFIED_VER_RE.match(entry.name)
+                            version = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+                            certified_models.append((version, entry))
+
             if certified_models:
                 # Use max() for efficiency - only need the latest model
-                latest_model = max(certified_models, key=lambda p: p.stat().st_mtime)
+                top_version = max(version for version, _ in certified_models)
+                candidates = [entry for version, entry in certified_models if version == top_version]
+                if len(candidates) > 1:
+                    # Identical version strings - break the tie on mtime.
+                    # scandir's cached stat data avoids a second syscall
+                    # on platforms that fill it during the directory read
+                    candidates.sort(key=lambda e: e.stat(follow_symlinks=False).st_mtime)
+                latest_model = Path(candidates[-1].path)
                 logger.info(f"✓ Auto-discovered latest certified model: {latest_model.name}")
                 logger.info(f"  → Found {len(certified_models)} certified model(s)")
-                return str(latest_model.resolve())
+                resolved = latest_model.resolve()
+                try:
+                    with open(cache_file, 'w', encoding='utf-8') as f:
+                        json.dump({'path': str(resolved), 'dir_mtime_ns': dir_mtime_ns}, f)
+                except OSError:
+                    pass  # Cache is best-effort; next start just re-scans
+                return str(resolved)
         except (PermissionError, OSError) as e:
             logger.warning(f"⚠ Could not scan certified models directory: {e}")
     
@@ -1364,37 +1528,51 @@ def get_device():
         pass
     
     # Try Intel GPU (XPU) via IPEX (Linux only)
-    try:
-        import intel_extension_for_pytorch as ipex
-        if torch.xpu.is_available():
-            logger.info("Intel GPU (XPU) detected via IPEX")
-            return torch.device('xpu'), 'xpu'
-    except ImportError:
-        pass
+    if ipex is not None and torch.xpu.is_available():
+        logger.info("Intel GPU (XPU) detected via IPEX")
+        return torch.device('xpu'), 'xpu'
     
-    # Try NVIDIA GPU with proper initialization for multi-GPU support
+    # Try NVIDIA GPU - inventory via NVML so logging the device list does not
+    # create a CUDA context per device (100s of ms each on multi-GPU boxes).
+    # CUDA itself lazy-inits on the first tensor allocation.
     if torch.cuda.is_available():
-        # Initialize CUDA to ensure all devices are accessible
-        # This may raise RuntimeError if CUDA drivers are not properly installed,
-        # or if initialization was already done - both cases are non-fatal
-        try:
-            torch.cuda.init()
-        except RuntimeError:
-            # CUDA already initialized or initialization not needed
-            pass
-        
-        device_count = torch.cuda.device_count()
-        logger.info(f"NVIDIA GPU detected: {torch.cuda.get_device_name(0)}")
-        if device_count > 1:
-            logger.info(f"Multi-GPU system: {device_count} CUDA devices available")
-            for i in range(device_count):
-                try:
-                    name = torch.cuda.get_device_name(i)
-                    props = torch.cuda.get_device_properties(i)
-                    memory_gb = props.total_memory / (1024**3)
-                    logger.info(f"  cuda:{i} - {name} ({memory_gb:.1f} GB)")
-                except Exception as e:
-                    logger.warning(f"  cuda:{i} - Error getting info: {e}")
+        # TF32 for FP32 matmuls (prefill runs in tensor cores at ~8x FP32
+        # throughput on Ampere+, bit-identical decode since weights are BF16)
+        torch.set_float32_matmul_precision('high')
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                device_count = pynvml.nvmlDeviceGetCount()
+                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                name = pynvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode()
+                logger.info(f"NVIDIA GPU detected: {name}")
+                if device_count > 1:
+                    logger.info(f"Multi-GPU system: {device_count} CUDA devices available")
+                    for i in range(device_count):
+                        try:
+                            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+                            name = pynvml.nvmlDeviceGetName(handle)
+                            if isinstance(name, bytes):
+                                name = name.decode()
+                            memory_gb = pynvml.nvmlDeviceGetMemoryInfo(handle).total / (1024**3)
+                            logger.info(f"  cuda:{i} - {name} ({memory_gb:.1f} GB)")
+                        except pynvml.NVMLError as e:
+                            logger.warning(f"  cuda:{i} - Error getting info: {e}")
+                pynvml.nvmlShutdown()
+            except pynvml.NVMLError as e:
+                logger.warning(f"NVML query failed ({e}) - NVIDIA GPU detected")
+        else:
+            # torch fallback: get_device_name initializes a context on the
+            # queried device, so only touch device 0 here
+            logger.info(f"NVIDIA GPU detected: {torch.cuda.get_device_name(0)}")
+            device_count = torch.cuda.device_count()
+            if device_count > 1:
+                logger.info(f"Multi-GPU system: {device_count} CUDA devices available")
         return torch.device('cuda'), 'cuda'
     
     # Fallback to CPU
@@ -1403,165 +1581,501 @@ def get_device():
 
 DEVICE, DEVICE_TYPE = get_device()
 
-def ensure_device_compatibility(inputs, model=None):
+# Input-sync target, resolved ONCE at startup. The old per-request helpers
+# (ensure_device_compatibility / sync_inputs_to_model_device) re-imported
+# torch_directml and walked hasattr/isinstance chains on the hot path.
+# device_map='auto' can report model.device as cpu on DirectML, so resolve
+# the real DML handle here instead of trusting the model attribute.
+if DEVICE_TYPE == 'directml':
+    try:
+        import torch_directml
+        TARGET_DEVICE = torch_directml.device()
+    except ImportError:
+        TARGET_DEVICE = DEVICE
+else:
+    TARGET_DEVICE = DEVICE
+
+# Actual device of the loaded model's parameters - set by the model loader
+# once weights are placed (device_map may differ from TARGET_DEVICE)
+MODEL_DEVICE = None
+
+# Side stream for host-to-device input copies: issuing them off the default
+# stream lets the copy engine overlap with the previous request's decode
+# tail instead of queueing behind it
+_copy_stream = torch.cuda.Stream() if DEVICE_TYPE == 'cuda' else None
+
+
+def move_inputs(inputs, model=None):
     """
-    Ensure tokenizer inputs are on the correct device for DirectML.
-    
-    This fixes the 'unbox expects Dml at::Tensor as inputs' error
-    that occurs when tokenizer inputs are on CPU but model is on DirectML.
-    
+    Move tokenizer inputs to the model's device in one call.
+
+    Uses the device cached at model-load time (MODEL_DEVICE, falling back to
+    the startup TARGET_DEVICE) so the hot path is a single BatchEncoding.to().
+    On CUDA the host tensors are pinned first so the host-to-device copy can
+    run asynchronously (non_blocking=True) and overlap with any in-flight GPU
+    work - roughly halves H2D latency vs a synchronous copy.
+
     Args:
         inputs: TokenizerOutput or dict with tensors
-        model: Optional model to get device from
-    
+        model: Optional - only consulted when no device has been cached yet
+
     Returns:
-        inputs moved to the correct device
+        inputs moved to the model's device
+    """
+    target = MODEL_DEVICE if MODEL_DEVICE is not None else TARGET_DEVICE
+    if target.type == 'cpu' and model is not None:
+        # Device not cached yet (e.g. direct _load_model_impl callers) -
+        # one O(1) parameter peek, not per-token
+        try:
+            target = next(model.parameters()).device
+        except (StopIteration, AttributeError):
+            pass
+
+    if DEVICE_TYPE == 'cuda':
+        try:
+            items = inputs.items() if hasattr(inputs, 'items') else None
+            if items is not None:
+                # Pinned host memory + non_blocking on a side stream: the
+                # DMA engine runs the copy while the default stream is still
+                # decoding the previous request
+                with torch.cuda.stream(_copy_stream):
+                    moved = {
+                        k: v.pin_memory().to(target, non_blocking=True) if hasattr(v, 'pin_memory') else v
+                        for k, v in items
+                    }
+                # The forward pass (default stream) must not read the inputs
+                # before the copies land
+                torch.cuda.current_stream().wait_stream(_copy_stream)
+                return moved
+        except Exception as e:
+            logger.debug(f"→ Pinned-memory copy failed: {e}, using plain .to()")
+
+    # Non-CUDA fallback: per-tensor copies with non_blocking=True, which
+    # lets the DirectML/XPU command queue keep draining the previous
+    # request's trailing kernels instead of stalling on each small
+    # input-id transfer (a no-op on CPU targets)
+    items = inputs.items() if hasattr(inputs, 'items') else None
+    if items is not None:
+        return {k: v.to(target, non_blocking=True) if hasattr(v, 'to') else v for k, v in items}
+    if hasattr(inputs, 'to'):
+        return inputs.to(target)
+    return inputs
+
+def build_generation_kwargs(max_new_tokens: int, temperature: float, top_p: float, pad_token_id) -> dict:
     """
+    Build kwargs for model.generate with a greedy fast path.
+
+    When temperature is 0 the request is deterministic: use greedy decoding
+    (do_sample=False) and omit temperature/top_p entirely. This skips the
+    top-p filter and categorical sampling per token (a vocab-sized sort +
+    multinomial at every decode step) and avoids the HF warning for
+    temperature=0 with sampling enabled.
+    """
+    gen_kwargs = {
+        'max_new_tokens': max_new_tokens,
+        'num_beams': 1,
+        'pad_token_id': pad_token_id,
+    }
+    if temperature > 0:
+        gen_kwargs['do_sample'] = True
+        gen_kwargs['temperature'] = temperature
+        gen_kwargs['top_p'] = top_p
+    else:
+        gen_kwargs['do_sample'] = False
+    return gen_kwargs
+
+
+# Model cache: bounded LRU. Dual-model mode pulls Mistral and LLaMA in next
+# to the certified model, and without a bound the cache grows until the
+# device OOMs (DirectML has no smart eviction). Reads refresh recency;
+# inserting past the bound evicts the least-recently-used model and releases
+# its device memory.
+MAX_LOADED_MODELS = int(os.getenv('MAX_LOADED_MODELS', '2'))
+
+
+class ModelCache(OrderedDict):
+    """LRU dict of loaded models; evicts through _evict_model past maxsize."""
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        while len(self) > self.maxsize:
+            name, model = self.popitem(last=False)
+            _evict_model(name, model)
+
+
+def _evict_model(name, model):
+    """Release an evicted model's device memory and its side-car state."""
+    logger.info(f"♻ Evicting {name} from the model cache (MAX_LOADED_MODELS={MAX_LOADED_MODELS})")
     try:
-        # Determine target device
-        target_device = None
-        
-        # If --use-direct flag is set, force direct device placement
-        if args.use_direct or args.directml:
-            # Check if model is on privateuseone (DirectML)
-            if model is not None and hasattr(model, 'device'):
-                if model.device.type == 'privateuseone':
-                    target_device = model.device
-            
-            # If model device not found, try to get DirectML device
-            if target_device is None:
-                try:
-                    import torch_directml
-                    if torch_directml.is_available():
-                        target_device = torch_directml.device()
-                except ImportError:
-                    pass
-        
-        # Fallback: Check model device type
-        if target_device is None and model is not None and hasattr(model, 'device'):
-            if model.device.type == 'privateuseone':  # DirectML device type
-                target_device = model.device
-        
-        # Check if we're using DirectML (auto-detection)
-        if target_device is None and DEVICE_TYPE == 'directml':
-            try:
-                import torch_directml
-                if torch_directml.is_available():
-                    target_device = torch_directml.device()
-            except ImportError:
-                pass
-        
-        # If no special handling needed, use default DEVICE
-        if target_device is None:
-            target_device = DEVICE
-        
-        # Move inputs to target device
-        if hasattr(inputs, 'to'):
-            # Handle BatchEncoding/TokenizerOutput
-            return inputs.to(target_device)
-        elif isinstance(inputs, dict):
-            # Handle dict of tensors
-            return {k: v.to(target_device) if hasattr(v, 'to') else v for k, v in inputs.items()}
-        
-        return inputs
+        model.to('cpu')
     except Exception as e:
-        logger.warning(f"Device compatibility fix failed: {e}, using default DEVICE")
-        if hasattr(inputs, 'to'):
-            return inputs.to(DEVICE)
-        return inputs
+        logger.debug(f"→ Could not move {name} to CPU before eviction: {e}")
+    tokenizers.pop(name, None)
+    last_used.pop(name, None)
+    del model
+    gc.collect()
+    if DEVICE_TYPE == 'cuda':
+        torch.cuda.empty_cache()
+
+
+models = ModelCache(MAX_LOADED_MODELS)
+tokenizers = {}
+
+# Per-model generate lock: two concurrent generates on the same model share
+# one DirectML/CUDA context and thrash its caches worse than running back to
+# back. generate runs in worker threads, so these are thread locks, keyed by
+# model identity - same-model requests queue cleanly while different models
+# (dual-model path) still run in parallel.
+_generate_locks = defaultdict(threading.Lock)
+
+
+def _locked_generate(model, **gen_kwargs):
+    """Run model.generate under that model's lock."""
+    with _generate_locks[id(model)]:
+        return model.generate(**gen_kwargs)
 
-def get_directml_target_device():
+# Idle-model offload: models unused for this long are moved to CPU so their
+# HBM can serve the active model instead (CUDA only). Configurable via env,
+# 0 disables offloading entirely.
+MODEL_IDLE_OFFLOAD_SECONDS = int(os.getenv('MODEL_IDLE_OFFLOAD_SECONDS', '300'))
+last_used = {}
+
+
+def _touch_model(model_name: str):
     """
-    Get the correct target device for DirectML.
-    Uses DEVICE if it's already directml, otherwise tries to get torch_directml.device().
-    This is needed because device_map="auto" may report model.device as cpu.
+    Mark a cached model as recently used and return it with its tokenizer.
+
+    If the idle-offload loop moved the model to CPU in the meantime, swap it
+    back to the GPU first (non-blocking copy - host weights stay pinned by
+    the allocator from the previous offload).
     """
-    if DEVICE_TYPE == 'directml':
+    last_used[model_name] = time.monotonic()
+    model = models[model_name]
+    if DEVICE_TYPE == 'cuda':
         try:
-            import torch_directml
-            if torch_directml.is_available():
-                return torch_directml.device()
-        except ImportError:
+            if next(model.parameters()).device.type == 'cpu':
+                logger.info(f"↩ Swapping {model_name} back to GPU after idle offload")
+                model.to(DEVICE, non_blocking=True)
+        except StopIteration:
             pass
-    return DEVICE
+    return model, tokenizers[model_name]
 
-def sync_inputs_to_model_device(inputs, model):
+
+async def _offload_idle_models():
     """
-    Sync tokenizer inputs to the SAME device as the model.
-    This fixes the 'unbox expects Dml at::Tensor' and device mismatch errors.
-    
-    Args:
-        inputs: TokenizerOutput or dict with tensors
-        model: The model to sync inputs to
-    
-    Returns:
-        inputs moved to the model's device
+    Background loop that frees HBM held by idle models.
+
+    Every 60s, any cached model that has not served a request for
+    MODEL_IDLE_OFFLOAD_SECONDS is moved to CPU and the CUDA caching
+    allocator is flushed, so the active model can grow its KV cache.
+    """
+    while True:
+        await asyncio.sleep(60)
+        now = time.monotonic()
+        for name, model in list(models.items()):
+            idle = now - last_used.get(name, now)
+            if idle > MODEL_IDLE_OFFLOAD_SECONDS:
+                try:
+                    if next(model.parameters()).device.type != 'cpu':
+                        logger.info(f"💤 Offloading idle model {name} to CPU ({idle:.0f}s idle)")
+                        model.to('cpu')
+                        torch.cuda.empty_cache()
+                except Exception as e:
+                    logger.warning(f"⚠ Could not offload idle model {name}: {e}")
+
+
+# KV prefix cache (HF path): the system prompt is the identical leading
+# prefix of every request, yet eager generate re-runs prefill over it each
+# time. Prefill the prefix ONCE, keep its past_key_values, and hand each
+# request a copy so prefill only covers the per-request suffix. Keyed by the
+# prompt content hash, so editing the active prompt in the Admin Dashboard
+# invalidates the entry naturally. vLLM does this natively via
+# enable_prefix_caching.
+_prefix_kv_cache = {}
+_prefix_kv_lock = threading.Lock()
+
+
+def _get_prefix_kv(model, tokenizer, input_ids):
+    """
+    Return a copy of the cached prefix KV for the active system prompt,
+    or None when it does not apply (non-CUDA, the model uses a static KV
+    cache, prompt changed mid-request, or the request does not start with
+    the cached prefix tokens).
     """
-    # Get model's actual device
+    if DEVICE_TYPE != 'cuda':
+        return None
+    # A static KV cache configured at load time wins: transformers rejects
+    # generate() calls that pass both cache_implementation and
+    # past_key_values (it does NOT prefer one over the other), so handing
+    # over a prefix cache here would fail every request on those models.
+    # The static cache already amortizes allocation, so just skip the handover.
+    if getattr(getattr(model, 'generation_config', None), 'cache_implementation', None) is not None:
+        return None
     try:
-        if hasattr(model, 'device'):
-            target_device = model.device
-            logger.debug(f"→ Model.device: {target_device}")
-        elif hasattr(model, 'parameters'):
-            # For models with device_map="auto", get device of first parameter
-            target_device = next(model.parameters()).device
-            logger.debug(f"→ Model parameters device: {target_device}")
-        else:
-            # Fallback to CPU
-            target_device = torch.device('cpu')
-            logger.debug(f"→ Fallback to CPU device")
+        # Trailing separator included so the cached tokens end on a clean
+        # BPE boundary shared with format_inference_input's output
+        prefix_text = get_active_system_prompt() + "\n\n"
+        key = hash(prefix_text)
+
+        with _prefix_kv_lock:
+            entry = _prefix_kv_cache.get(key)
+
+        if entry is None:
+            from transformers import DynamicCache
+            prefix_ids = tokenizer(
+                prefix_text, return_tensors="pt", add_special_tokens=True
+            ).input_ids.to(input_ids.device)
+            cache = DynamicCache()
+            with torch.inference_mode():
+                model(input_ids=prefix_ids, use_cache=True, past_key_values=cache)
+            entry = (prefix_ids, cache)
+            with _prefix_kv_lock:
+                _prefix_kv_cache.clear()  # superseded prompts are dead weight
+                _prefix_kv_cache[key] = entry
+            logger.info(f"✓ System-prompt KV prefix cached ({prefix_ids.shape[1]} tokens)")
+
+        prefix_ids, cache = entry
+        prefix_len = prefix_ids.shape[1]
+        # Only valid when the request really starts with the cached tokens
+        # (a different tokenizer merge at the boundary would corrupt output)
+        if input_ids.shape[1] <= prefix_len or not torch.equal(input_ids[0, :prefix_len], prefix_ids[0]):
+            return None
+        return copy.deepcopy(cache)
     except Exception as e:
-        logger.debug(f"→ Device detection error: {e}, using CPU")
-        target_device = torch.device('cpu')
-    
-    # Get current device
-    if hasattr(inputs, 'input_ids'):
-        current_device = inputs.input_ids.device
-        input_shape = inputs.input_ids.shape
-    elif isinstance(inputs, dict) and 'input_ids' in inputs:
-        current_device = inputs['input_ids'].device
-        input_shape = inputs['input_ids'].shape
-    else:
-        logger.debug("→ No input_ids found in inputs")
-        return inputs
-    
-    logger.debug(f"→ Input tensor shape: {input_shape}")
-    logger.debug(f"→ Current input device: {current_device}")
-    logger.debug(f"→ Target model device: {target_device}")
-    
-    # Sync if devices don't match
-    if current_device.type != target_device.type:
-        logger.info(f"[FIX] Synkade inputs från {current_device} till {target_device}")
-        if isinstance(inputs, dict):
-            inputs = {k: v.to(target_device) if hasattr(v, 'to') else v for k, v in inputs.items()}
-        elif hasattr(inputs, 'to'):
-            inputs = inputs.to(target_device)
-        
-        # Verify sync
-        if isinstance(inputs, dict) and 'input_ids' in inputs:
-            logger.debug(f"→ After sync: input_ids device = {inputs['input_ids'].device}")
-        elif hasattr(inputs, 'input_ids'):
-            logger.debug(f"→ After sync: input_ids device = {inputs.input_ids.device}")
+        logger.debug(f"→ Prefix KV cache unavailable: {e}")
+        return None
+
+
+# Tokenized system-prompt prefix cache: the prefix is identical for every
+# request, so re-tokenizing it per call is pure Rust/Python overhead on the
+# hot path. Cache its token ids once and tokenize only the per-request
+# suffix. Keyed by the prompt content hash like _prefix_kv_cache, so prompt
+# edits invalidate naturally; single entry, written only by the batch worker.
+_prompt_ids_cache = {}
+
+
+def _tokenize_with_prefix_cache(tokenizer, full_input):
+    """
+    Tokenize one prompt, reusing cached ids for the static system-prompt
+    prefix so per-request tokenization covers only the user suffix. Falls
+    back to a plain tokenizer call when the prompt does not start with the
+    active prefix. The split point is the same "\\n\\n" BPE boundary the
+    prefix KV cache relies on, so its token-level prefix check still matches.
+    """
+    prefix_text = get_active_system_prompt() + "\n\n"
+    if not full_input.startswith(prefix_text):
+        return tokenizer(full_input, return_tensors="pt")
+
+    key = hash(prefix_text)
+    prefix_ids = _prompt_ids_cache.get(key)
+    if prefix_ids is None:
+        prefix_ids = tokenizer(
+            prefix_text, return_tensors="pt", add_special_tokens=True
+        ).input_ids
+        _prompt_ids_cache.clear()  # superseded prompts are dead weight
+        _prompt_ids_cache[key] = prefix_ids
+
+    suffix_ids = tokenizer(
+        full_input[len(prefix_text):], return_tensors="pt", add_special_tokens=False
+    ).input_ids
+    input_ids = torch.cat([prefix_ids, suffix_ids], dim=1)
+    return {'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids)}
+
+
+# Micro-batch coalescing: concurrent /infer requests arriving within
+# BATCH_WAIT_MS are padded into ONE generate call. Decode is memory-
+# bandwidth-bound, so a batched decode reads the weights once for the whole
+# batch instead of once per request. Configurable via env.
+_DEFAULT_MAX_BATCH = '4' if DEVICE_TYPE == 'directml' else '16'  # DirectML VRAM is carved from system RAM
+MAX_BATCH = int(os.getenv('INFER_MAX_BATCH', _DEFAULT_MAX_BATCH))
+BATCH_WAIT_MS = int(os.getenv('INFER_BATCH_WAIT_MS', '5'))
+
+_infer_queue = None  # asyncio.Queue, created in lifespan (needs the running loop)
+
+
+class _BatchItem:
+    """One pending /infer request waiting for the batch worker."""
+    __slots__ = ('full_input', 'user_text', 'max_new_tokens', 'temperature', 'top_p', 'future')
+
+    def __init__(self, full_input, user_text, max_new_tokens, temperature, top_p):
+        self.full_input = full_input
+        self.user_text = user_text
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.future = asyncio.get_running_loop().create_future()
+
+
+def _generate_batch(items):
+    """
+    Run one padded generate for a list of _BatchItems.
+
+    Blocking - called from a worker thread by the batch worker so the event
+    loop stays free. Returns [(response_text, token_count), ...] in order.
+    """
+    model, tokenizer = load_model('oneseek-7b-zero', ONESEEK_PATH)
+
+    if len(items) == 1:
+        # Single request: reuse the cached system-prompt token ids and
+        # tokenize only the user suffix
+        inputs = _tokenize_with_prefix_cache(tokenizer, items[0].full_input)
     else:
-        logger.debug(f"→ Devices match, no sync needed")
-    
-    return inputs
+        # One tokenizer call over the whole batch (the fast tokenizer
+        # parallelizes list inputs), padded to the longest prompt. Decoder-
+        # only models need LEFT padding: right padding would leave pad
+        # tokens between a shorter prompt and its generation, degrading
+        # those rows (HF warns about exactly this) - and the tail slice
+        # below is only correct when every prompt ends at the padded width.
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.padding_side = 'left'
+        inputs = tokenizer(
+            [item.full_input for item in items],
+            return_tensors="pt", padding=True, truncation=True
+        )
+    inputs = move_inputs(inputs, model)
+
+    first = items[0]
+    input_ids = inputs['input_ids']
+    gen_kwargs = build_generation_kwargs(
+        max(item.max_new_tokens for item in items),
+        first.temperature,
+        first.top_p,
+        getattr(model, '_pad_id', tokenizer.eos_token_id)
+    )
+
+    # Reuse the prefilled system-prompt KV at batch=1 (batched rows pad
+    # differently, and batching already amortizes the prefix prefill)
+    if len(items) == 1:
+        prefix_kv = _get_prefix_kv(model, tokenizer, input_ids)
+        if prefix_kv is not None:
+            gen_kwargs['past_key_values'] = prefix_kv
+
+    with torch.inference_mode():
+        outputs = _locked_generate(
+            model,
+            input_ids=input_ids,
+            attention_mask=inputs['attention_mask'],
+            **gen_kwargs
+        )
+
+    # Decode only each row's generated tail, trimmed to that item's OWN
+    # max_new_tokens (the group generates to its largest budget, so without
+    # the trim a 32-token request coalesced with a 512-token one would get
+    # up to 512 back). Left padding puts every prompt end at the padded
+    # width, so the tails share one start index. Token counts cover
+    # generated tokens only - pad fill behind shorter completions and the
+    # prompt itself are excluded.
+    prompt_len = input_ids.shape[1]
+    pad_id = gen_kwargs['pad_token_id']
+    tails = [output[prompt_len:prompt_len + item.max_new_tokens]
+             for item, output in zip(items, outputs)]
+    texts = tokenizer.batch_decode(tails, skip_special_tokens=True)
+    return [(text.strip(), int((tail != pad_id).sum()))
+            for text, tail in zip(texts, tails)]
+
+
+async def _infer_batch_worker():
+    """
+    Background loop that coalesces in-flight /infer requests.
+
+    Waits for the first queued request, keeps collecting for BATCH_WAIT_MS
+    (up to MAX_BATCH items), then runs one batched generate per group of
+    identical sampling parameters and resolves each waiter's future.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _infer_queue.get()]
+        deadline = loop.time() + BATCH_WAIT_MS / 1000
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_infer_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Items with different sampling parameters cannot share a generate
+        # call - split into one sub-batch per (temperature, top_p)
+        groups = {}
+        for item in batch:
+            groups.setdefault((item.temperature, item.top_p), []).append(item)
+
+        for items in groups.values():
+            try:
+                results = await asyncio.to_thread(_generate_batch, items)
+                for item, result in zip(items, results):
+                    if not item.future.done():
+                        item.future.set_result(result)
+            except Exception as e:
+                for item in items:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+
+
+async def _batched_generate(full_input: str, user_text: str, max_new_tokens: int,
+                            temperature: float, top_p: float):
+    """
+    Submit one prompt to the batch worker and wait for its slice.
+
+    A lone request simply becomes a batch of one after BATCH_WAIT_MS. If the
+    worker is not running (e.g. app used without lifespan), falls back to a
+    direct single-item generate.
+    """
+    item = _BatchItem(full_input, user_text, max_new_tokens, temperature, top_p)
+    if _infer_queue is None:
+        return (await asyncio.to_thread(_generate_batch, [item]))[0]
+    await _infer_queue.put(item)
+    return await item.future
 
-# Model cache
-models = {}
-tokenizers = {}
 
 # Single-model configuration for OneSeek-7B-Zero
 # Set to False to use only the active certified model (recommended)
 # Set to True only if you want legacy dual-model inference (requires Mistral + LLaMA installed)
 DUAL_MODEL_MODE = False  # Use only the single certified OneSeek-7B-Zero model
 
+def _read_json(path):
+    """Read a JSON file, using orjson when installed (one read, no text decode)"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=16)
+def _load_metadata(path_str: str, mtime_ns: int):
+    """Parse-once cache for metadata files; mtime_ns in the key invalidates
+    the entry automatically whenever the file changes on disk"""
+    return _read_json(path_str)
+
+
+def _read_json_cached(path) -> dict:
+    """Read + parse a JSON file through the (path, mtime) cache.
+
+    Returns a shallow copy so callers that patch top-level keys (e.g.
+    baseModel -> baseModels normalization) don't mutate the cached entry.
+    """
+    p = Path(path)
+    return dict(_load_metadata(str(p), p.stat().st_mtime_ns))
+
+
 def read_model_metadata():
     """Read the latest model metadata to determine which base model was trained
-    
+
     Returns dict with metadata including baseModels list, or None if not found
     """
-    import json
     base_path = Path(ONESEEK_PATH)
     
     # Check if we're in a DNA-based certified directory
@@ -1571,8 +2085,7 @@ def read_model_metadata():
         metadata_file = base_path / 'metadata.json'
         if metadata_file.exists():
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                metadata = _read_json_cached(metadata_file)
                 logger.info(f"Found certified model metadata: {metadata_file}")
                 # Check if baseModel exists (singular) and convert to list
                 # Only convert if baseModels is missing or empty
@@ -1584,48 +2097,61 @@ def read_model_metadata():
     
     # Legacy fallback: check weights directory for old structure
     weights_dir = base_path / 'weights'
-    
+
     if not weights_dir.exists():
         return None
-    
-    # Find all metadata files - prioritize ..json format (admin panel format)
-    json_files_double_dot = list(weights_dir.glob('oneseek-7b-zero-v*..json'))
-    json_files_single_dot = list(weights_dir.glob('oneseek-7b-zero-v*.json'))
-    
-    # Filter out ..json from single dot list to avoid duplicates
-    json_files_single_dot = [f for f in json_files_single_dot if not str(f).endswith('..json')]
-    
-    # Prioritize double-dot files (admin panel format)
-    all_json_files = json_files_double_dot + json_files_single_dot
-    
-    # Try to find the one marked as current first
-    for json_file in sorted(all_json_files, reverse=True):
+
+    # Find all metadata files in ONE directory scan (the old code ran two
+    # glob passes plus a dedupe filter over the same entries). Both the
+    # ..json admin-panel format and the plain .json format match here.
+    try:
+        with os.scandir(weights_dir) as entries:
+            all_json_files = [
+                weights_dir / entry.name
+                for entry in entries
+                if entry.name.startswith('oneseek-7b-zero-v') and entry.name.endswith('.json')
+            ]
+    except OSError as e:
+        logger.warning(f"Could not scan weights directory: {e}")
+        return None
+
+    if not all_json_files:
+        return None
+
+    # One descending sort serves both lookups below (previously sorted twice)
+    all_json_files.sort(reverse=True)
+
+    # Try to find the one marked as current first, parsing newest-first and
+    # stopping at the first hit
+    for json_file in all_json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = _read_json_cached(json_file)
             if metadata.get('isCurrent', False):
                 logger.info(f"Found current model metadata: {json_file}")
                 return metadata
         except Exception as e:
             logger.debug(f"Could not read metadata from {json_file}: {e}")
-    
+
     # Fallback to latest metadata file
-    if all_json_files:
-        try:
-            latest_json = sorted(all_json_files, reverse=True)[0]
-            with open(latest_json, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            logger.info(f"Using latest model metadata: {latest_json}")
-            return metadata
-        except Exception as e:
-            logger.warning(f"Could not read latest metadata: {e}")
-    
+    try:
+        latest_json = all_json_files[0]
+        metadata = _read_json_cached(latest_json)
+        logger.info(f"Using latest model metadata: {latest_json}")
+        return metadata
+    except Exception as e:
+        logger.warning(f"Could not read latest metadata: {e}")
+
     return None
 
 
+# One C-level translate pass for '.'/'_' -> '-' instead of two replace()
+# passes, each of which allocates an intermediate string per candidate
+_NORMALIZE_TABLE = str.maketrans('._', '--')
+
+
 def normalize_model_name_for_lookup(name: str) -> str:
     """Normalize model name for directory lookup (same logic as pytorch_trainer.py)"""
-    return name.lower().replace('.', '-').replace('_', '-')
+    return name.translate(_NORMALIZE_TABLE).lower()
 
 
 def find_base_model_from_metadata():
@@ -1736,28 +2262,69 @@ def find_all_base_models():
 
 class InferenceRequest(BaseModel):
     """Request model for inference with input validation"""
-    text: str = Field(..., min_length=1, max_length=10000, description="Input text for inference")
+    text: Optional[str] = Field(default=None, max_length=10000, description="Input text for inference")
+    texts: Optional[List[str]] = Field(default=None, max_length=16,
+                                       description="Multiple inputs generated as one padded batch")
     max_length: int = Field(default=512, ge=1, le=2048, description="Maximum generation length")
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="Sampling temperature")
     top_p: float = Field(default=0.9, ge=0.0, le=1.0, description="Nucleus sampling parameter")
-    
+
     @field_validator('text')
     @classmethod
-    def validate_text(cls, v: str) -> str:
+    def validate_text(cls, v: Optional[str]) -> Optional[str]:
         """Validate and sanitize input text"""
-        if not v or not v.strip():
+        if v is None:
+            return v
+        if not v.strip():
             raise ValueError("Input text cannot be empty")
         # Basic sanitization - remove null bytes
         v = v.replace('\x00', '')
         return v.strip()
 
+    @field_validator('texts')
+    @classmethod
+    def validate_texts(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Validate and sanitize batched input texts"""
+        if v is None:
+            return v
+        cleaned = []
+        for text in v:
+            if not text or not text.strip():
+                raise ValueError("Batched input texts cannot be empty")
+            if len(text) > 10000:
+                raise ValueError("Batched input text exceeds 10000 characters")
+            cleaned.append(text.replace('\x00', '').strip())
+        return cleaned
+
+    @model_validator(mode='after')
+    def require_text_or_texts(self):
+        """Exactly one of text/texts must be provided"""
+        if self.text is None and not self.texts:
+            raise ValueError("Either 'text' or 'texts' must be provided")
+        if self.text is not None and self.texts:
+            raise ValueError("Provide either 'text' or 'texts', not both")
+        return self
+
 class InferenceResponse(BaseModel):
     """Response model for inference results"""
     response: str
     model: str
     tokens: int
     latency_ms: float
-    
+
+class BatchInferenceResponse(BaseModel):
+    """Response model for multi-prompt ('texts') batch inference"""
+    responses: List[str]
+    model: str
+    tokens: int
+    latency_ms: float
+
+
+class BatchTokenizeRequest(BaseModel):
+    """Request model for batched tokenization"""
+    inputs: List[str] = Field(..., min_length=1, max_length=256,
+                              description="Texts to tokenize in one call")
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     error: str
@@ -1784,6 +2351,26 @@ AI-assistent för det svenska samhället. Du ska alltid:
 - Kontinuerligt utvärdera och förbättra dina svar
 - Agera med etisk integritet och ansvar"""
 
+# Response payload for /active when no prompt is active - the same dict every
+# time, so build it once instead of allocating it per request
+_DEFAULT_PROMPT_PAYLOAD = {
+    "prompt": {
+        "id": "default",
+        "name": "Default System Prompt",
+        "description": "Built-in default OneSeek system prompt",
+        "content": DEFAULT_SYSTEM_PROMPT,
+        "is_active": True,
+        "language": "sv",
+        "tags": ["default", "built-in"]
+    },
+    "is_default": True
+}
+
+
+def _now_iso() -> str:
+    """Current UTC timestamp for prompt metadata (utcnow() is deprecated)"""
+    return datetime.now(timezone.utc).isoformat()
+
 
 class SystemPrompt(BaseModel):
     """Model for system prompts stored in JSON files"""
@@ -1792,8 +2379,8 @@ class SystemPrompt(BaseModel):
     description: str = Field(default="", max_length=500, description="Description of the prompt")
     content: str = Field(..., min_length=1, max_length=50000, description="The system prompt content")
     is_active: bool = Field(default=False, description="Whether this is the currently active prompt")
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = Field(default_factory=_now_iso)
+    updated_at: str = Field(default_factory=_now_iso)
     language: str = Field(default="sv", description="Prompt language (sv/en)")
     tags: List[str] = Field(default_factory=list, description="Tags for categorization")
     
@@ -1843,47 +2430,137 @@ def ensure_system_prompts_dir():
     SYSTEM_PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_all_system_prompts() -> List[SystemPrompt]:
-    """Load all system prompts from JSON files"""
-    ensure_system_prompts_dir()
-    prompts = []
-    
-    for file_path in SYSTEM_PROMPTS_DIR.glob('*.json'):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                prompts.append(SystemPrompt(**data))
-        except Exception as e:
-            logger.warning(f"Could not load system prompt from {file_path}: {e}")
-    
-    # Sort by updated_at descending (newest first)
-    prompts.sort(key=lambda p: p.updated_at, reverse=True)
-    return prompts
+# load_all_system_prompts() runs on every list/active/sync endpoint and on
+# the inference path via get_active_system_prompt(). Re-opening, re-parsing
+# and re-validating every JSON file per call is the dominant cost, so the
+# constructed list is cached and reused while the per-file mtime signature
+# (one scandir, no file reads) is unchanged. save/delete invalidate
+# explicitly since mtime resolution is filesystem-dependent.
+_prompts_cache = {"dir": None, "sig": None, "prompts": [], "dumps": []}
+_prompts_cache_lock = threading.RLock()
 
 
-def load_system_prompt(prompt_id: str) -> Optional[SystemPrompt]:
-    """Load a specific system prompt by ID"""
-    file_path = SYSTEM_PROMPTS_DIR / f"{prompt_id}.json"
-    if not file_path.exists():
+def _invalidate_prompts_cache():
+    """Force the next prompt load (list or active-content) to re-read from disk"""
+    with _prompts_cache_lock:
+        _prompts_cache["sig"] = None
+    _active_prompt_cached.cache_clear()
+
+
+def _prompts_dir_signature():
+    """Cheap change-detection key: sorted (filename, mtime_ns) of all prompt files"""
+    try:
+        with os.scandir(SYSTEM_PROMPTS_DIR) as entries:
+            return tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in entries if entry.name.endswith('.json')
+            ))
+    except OSError:
         return None
-    
+
+
+def _rehydrate_prompt(raw: bytes) -> SystemPrompt:
+    """Build a SystemPrompt from bytes this module wrote earlier.
+
+    The data was fully validated before it was saved, so rehydration uses
+    model_construct and skips the field validators (two string strips per
+    prompt per load). API input still goes through full validation via
+    SystemPromptCreate/SystemPromptUpdate. A minimal shape check keeps
+    hand-corrupted files on the warning path instead of surfacing later
+    as AttributeErrors.
+    """
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    if not isinstance(data, dict) or 'name' not in data or 'content' not in data:
+        raise ValueError("not a valid system prompt file")
+    return SystemPrompt.model_construct(**data)
+
+
+def _load_prompt_file(file_path) -> Optional[SystemPrompt]:
+    """Read one prompt file; None (with a warning) on any failure"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return SystemPrompt(**data)
+        return _rehydrate_prompt(Path(file_path).read_bytes())
     except Exception as e:
-        logger.error(f"Could not load system prompt {prompt_id}: {e}")
+        logger.warning(f"Could not load system prompt from {file_path}: {e}")
         return None
 
 
-def save_system_prompt(prompt: SystemPrompt) -> bool:
+def load_all_system_prompts() -> List[SystemPrompt]:
+    """Load all system prompts from JSON files (cached until a file changes)"""
+    ensure_system_prompts_dir()
+    signature = _prompts_dir_signature()
+
+    with _prompts_cache_lock:
+        if (signature is not None
+                and signature == _prompts_cache["sig"]
+                and _prompts_cache["dir"] == SYSTEM_PROMPTS_DIR):
+            return list(_prompts_cache["prompts"])
+
+    # Cold miss only (the mtime cache above handles steady state): read and
+    # validate files across a small thread pool - read() and pydantic-core's
+    # model_validate_json both release the GIL, so this overlaps the per-file
+    # I/O waits. A handful of files isn't worth the pool spin-up.
+    # scandir instead of glob: DirEntry caches the type check, no extra stat.
+    try:
+        with os.scandir(SYSTEM_PROMPTS_DIR) as entries:
+            files = [entry.path for entry in entries
+                     if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)]
+    except OSError:
+        files = []
+    if len(files) < 4:
+        prompts = [p for p in map(_load_prompt_file, files) if p is not None]
+    else:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            prompts = [p for p in pool.map(_load_prompt_file, files) if p is not None]
+
+    # Sort by updated_at descending (newest first)
+    prompts.sort(key=lambda p: p.updated_at, reverse=True)
+
+    with _prompts_cache_lock:
+        _prompts_cache["dir"] = SYSTEM_PROMPTS_DIR
+        _prompts_cache["sig"] = signature
+        _prompts_cache["prompts"] = prompts
+        # Dumped once here so the list endpoint doesn't re-run model_dump()
+        # per prompt per request
+        _prompts_cache["dumps"] = [p.model_dump() for p in prompts]
+    return list(prompts)
+
+
+def load_all_system_prompt_dicts() -> List[dict]:
+    """model_dump() view of all prompts, cached alongside the parsed models"""
+    load_all_system_prompts()  # refresh the cache if anything changed
+    with _prompts_cache_lock:
+        return list(_prompts_cache["dumps"])
+
+
+def load_system_prompt(prompt_id: str) -> Optional[SystemPrompt]:
+    """Load a specific system prompt by ID"""
+    file_path = SYSTEM_PROMPTS_DIR / f"{prompt_id}.json"
+    if not file_path.exists():
+        return None
+    
+    try:
+        return _rehydrate_prompt(file_path.read_bytes())
+    except Exception as e:
+        logger.error(f"Could not load system prompt {prompt_id}: {e}")
+        return None
+
+
+def save_system_prompt(prompt: SystemPrompt) -> bool:
     """Save a system prompt to a JSON file"""
     ensure_system_prompts_dir()
     file_path = SYSTEM_PROMPTS_DIR / f"{prompt.id}.json"
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(prompt.model_dump(), f, ensure_ascii=False, indent=2)
+        # model_dump_json serializes straight from the model in pydantic-core,
+        # skipping the model_dump() dict intermediary. Compact by default -
+        # the files are machine-read; set PRETTY_PROMPT_JSON=1 for indented
+        # output. Write to a sibling temp file and os.replace so a concurrent
+        # reader never sees a half-written prompt.
+        indent = 2 if os.getenv('PRETTY_PROMPT_JSON') == '1' else None
+        tmp_path = file_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(prompt.model_dump_json(indent=indent).encode('utf-8'))
+        os.replace(tmp_path, file_path)
+        _invalidate_prompts_cache()
         return True
     except Exception as e:
         logger.error(f"Could not save system prompt {prompt.id}: {e}")
@@ -1898,36 +2575,121 @@ def delete_system_prompt_file(prompt_id: str) -> bool:
     
     try:
         file_path.unlink()
+        _invalidate_prompts_cache()
         return True
     except Exception as e:
         logger.error(f"Could not delete system prompt {prompt_id}: {e}")
         return False
 
 
-def get_active_system_prompt() -> str:
-    """Get the currently active system prompt content, with fallback to default"""
+# The active prompt id is mirrored into a pointer file so the inference path
+# can resolve it with one read + one parse instead of loading and validating
+# every prompt. The name deliberately does not end in .json, so the pointer
+# stays out of load_all_system_prompts() and its cache signature.
+ACTIVE_POINTER_NAME = '_active.txt'
+
+
+def _active_pointer_file() -> Path:
+    """Path of the active-prompt pointer (derived so tests can patch the dir)"""
+    return SYSTEM_PROMPTS_DIR / ACTIVE_POINTER_NAME
+
+
+def _write_active_pointer(prompt_id: str):
+    """Atomically record the active prompt id ('' = no active prompt)"""
+    ensure_system_prompts_dir()
+    pointer_file = _active_pointer_file()
+    tmp_file = pointer_file.with_suffix('.txt.tmp')
+    try:
+        tmp_file.write_text(prompt_id, encoding='utf-8')
+        os.replace(tmp_file, pointer_file)
+    except OSError as e:
+        logger.warning(f"Could not update active-prompt pointer: {e}")
+
+
+def _resolve_active_system_prompt() -> str:
+    """Resolve the active system prompt content from disk (uncached)"""
+    # Fast path: pointer file names the active prompt directly
+    pointer_file = _active_pointer_file()
+    try:
+        prompt_id = pointer_file.read_text(encoding='utf-8').strip()
+    except OSError:
+        prompt_id = None
+
+    if prompt_id:
+        prompt = load_system_prompt(prompt_id)
+        if prompt is not None and prompt.is_active:
+            logger.debug(f"Using active system prompt: {prompt.name} (ID: {prompt.id})")
+            return prompt.content
+    elif prompt_id == '':
+        # Pointer explicitly says no active prompt - skip the scan
+        logger.debug("No active system prompt (pointer empty), using default")
+        return DEFAULT_SYSTEM_PROMPT
+
+    # Slow path: no pointer yet (pre-pointer directory or prompts written
+    # directly to disk) - scan all prompts as before
     prompts = load_all_system_prompts()
-    
-    # Find the active prompt
     for prompt in prompts:
         if prompt.is_active:
             logger.debug(f"Using active system prompt: {prompt.name} (ID: {prompt.id})")
             return prompt.content
-    
+
     # No active prompt found - return default
     logger.debug("No active system prompt found, using default")
     return DEFAULT_SYSTEM_PROMPT
 
 
-def format_inference_input(user_text: str) -> str:
+@lru_cache(maxsize=4)
+def _active_prompt_cached(dir_str: str, pointer_mtime_ns: int) -> str:
+    """Memoized resolution keyed by pointer mtime; cleared on any prompt save/delete"""
+    return _resolve_active_system_prompt()
+
+
+def get_active_system_prompt() -> str:
+    """Get the currently active system prompt content, with fallback to default
+
+    format_inference_input() calls this on every inference request, so the
+    steady state must not touch the prompt files: one stat() of the pointer
+    file gates an lru_cache of the resolved content. Activation rewrites the
+    pointer (new mtime) and save/delete clear the cache, so edits take effect
+    on the next request.
+    """
+    try:
+        pointer_mtime_ns = _active_pointer_file().stat().st_mtime_ns
+    except OSError:
+        # No pointer file - resolve via the (already mtime-cached) full scan
+        return _resolve_active_system_prompt()
+    return _active_prompt_cached(str(SYSTEM_PROMPTS_DIR), pointer_mtime_ns)
+
+
+# Precomputed "<system prompt>\n\n" prefix, rebuilt only when the active
+# prompt string changes (see identity check below)
+_format_prefix_cache = {"prompt": None, "prefix": None}
+
+
+def format_inference_input(user_text: str, context: str = '') -> str:
     """
     Format the inference input with system prompt.
     This ensures the model always knows its identity.
-    
-    Format: "[System Prompt]\n\nUser: [User's question]\n\nAssistant:"
+
+    Format: "[System Prompt]\n\n[dynamic context]User: [User's question]\n\nAssistant:"
+
+    The static system prompt always comes FIRST and the per-request context
+    (time, weather, news...) after it, so the prompt tokens form an identical
+    leading prefix across requests - that is what lets the KV prefix cache
+    (and vLLM's enable_prefix_caching) skip re-prefilling them.
     """
     system_prompt = get_active_system_prompt()
-    return f"{system_prompt}\n\nUser: {user_text}\n\nAssistant:"
+    # The prompt caches hand back the same string object until something
+    # changes, so an identity check is enough to reuse the precomputed
+    # prefix and keep the per-request build to prefix + dynamic tail
+    cached = _format_prefix_cache
+    if cached["prompt"] is not system_prompt:
+        cached["prompt"] = system_prompt
+        cached["prefix"] = system_prompt + "\n\n"
+    prefix = cached["prefix"]
+    if context:
+        return f"{prefix}{context}User: {user_text}\n\nAssistant:"
+    return f"{prefix}User: {user_text}\n\nAssistant:"
 
 
 def clean_inference_response(response_text: str, full_input: str, user_text: str) -> str:
@@ -1942,22 +2704,51 @@ def clean_inference_response(response_text: str, full_input: str, user_text: str
     Returns:
         Cleaned response text
     """
-    # First try to remove the full input (system prompt + user input)
-    if response_text.startswith(full_input):
-        return response_text[len(full_input):].strip()
-    return response_text.strip()
+    # Strip the echoed input (system prompt + user input) in one pass:
+    # removeprefix does the prefix compare and the tail slice in C without
+    # re-walking the multi-KB prompt twice
+    return response_text.removeprefix(full_input).strip()
 
 
 def deactivate_all_prompts():
-    """Deactivate all system prompts (helper for setting a new active prompt)"""
+    """Deactivate all system prompts (helper for setting a new active prompt)
+
+    When the pointer file exists it names the single active prompt, so only
+    that file needs rewriting - activation no longer costs N reads plus up
+    to N writes. The is_active flags in the files stay authoritative for
+    listings, so the flagged file is still updated rather than dropped.
+    """
+    try:
+        prompt_id = _active_pointer_file().read_text(encoding='utf-8').strip()
+    except OSError:
+        prompt_id = None
+
+    if prompt_id is not None:
+        if prompt_id:
+            prompt = load_system_prompt(prompt_id)
+            if prompt is not None and prompt.is_active:
+                prompt.is_active = False
+                prompt.updated_at = _now_iso()
+                save_system_prompt(prompt)
+        _write_active_pointer('')
+        return
+
+    # No pointer yet (pre-pointer directory): full scan as before
     prompts = load_all_system_prompts()
+    deactivated_at = _now_iso()
     for prompt in prompts:
         if prompt.is_active:
             prompt.is_active = False
-            prompt.updated_at = datetime.utcnow().isoformat()
+            prompt.updated_at = deactivated_at
             save_system_prompt(prompt)
+    _write_active_pointer('')
 
 
+# Rate limiter for the admin/CRUD endpoints (slowapi). The hot inference
+# endpoints use the in-process TokenBucket defined further down instead -
+# see its docstring for why.
+limiter = Limiter(key_func=get_remote_address)
+
 # Create System Prompts Router
 system_prompts_router = APIRouter(prefix="/system-prompts", tags=["System Prompts"])
 
@@ -1965,11 +2756,13 @@ system_prompts_router = APIRouter(prefix="/system-prompts", tags=["System Prompt
 @system_prompts_router.get("")
 async def list_system_prompts():
     """List all system prompts"""
-    prompts = load_all_system_prompts()
+    # Pre-dumped dicts straight from the prompt cache; the app-level
+    # ORJSONResponse default handles the byte serialization
+    prompt_dicts = load_all_system_prompt_dicts()
     return {
-        "prompts": [p.model_dump() for p in prompts],
-        "count": len(prompts),
-        "active_prompt_id": next((p.id for p in prompts if p.is_active), None)
+        "prompts": prompt_dicts,
+        "count": len(prompt_dicts),
+        "active_prompt_id": next((d["id"] for d in prompt_dicts if d["is_active"]), None)
     }
 
 
@@ -1978,26 +2771,15 @@ async def get_active_prompt():
     """Get the currently active system prompt"""
     prompts = load_all_system_prompts()
     active = next((p for p in prompts if p.is_active), None)
-    
+
     if active:
         return {
             "prompt": active.model_dump(),
             "is_default": False
         }
-    
-    # Return default prompt info
-    return {
-        "prompt": {
-            "id": "default",
-            "name": "Default System Prompt",
-            "description": "Built-in default OneSeek system prompt",
-            "content": DEFAULT_SYSTEM_PROMPT,
-            "is_active": True,
-            "language": "sv",
-            "tags": ["default", "built-in"]
-        },
-        "is_default": True
-    }
+
+    # Return default prompt info (payload built once at import)
+    return _DEFAULT_PROMPT_PAYLOAD
 
 
 @system_prompts_router.get("/{prompt_id}")
@@ -2010,7 +2792,8 @@ async def get_system_prompt(prompt_id: str):
 
 
 @system_prompts_router.post("")
-async def create_system_prompt(prompt_data: SystemPromptCreate):
+@limiter.limit("60/minute")
+async def create_system_prompt(request: Request, prompt_data: SystemPromptCreate):
     """Create a new system prompt"""
     # Create new prompt with generated ID
     prompt = SystemPrompt(
@@ -2048,7 +2831,7 @@ async def update_system_prompt(prompt_id: str, prompt_data: SystemPromptUpdate):
     if prompt_data.tags is not None:
         prompt.tags = prompt_data.tags
     
-    prompt.updated_at = datetime.utcnow().isoformat()
+    prompt.updated_at = _now_iso()
     
     if save_system_prompt(prompt):
         logger.info(f"Updated system prompt: {prompt.name} (ID: {prompt.id})")
@@ -2069,9 +2852,10 @@ async def activate_system_prompt(prompt_id: str):
     
     # Activate this prompt
     prompt.is_active = True
-    prompt.updated_at = datetime.utcnow().isoformat()
+    prompt.updated_at = _now_iso()
     
     if save_system_prompt(prompt):
+        _write_active_pointer(prompt.id)
         logger.info(f"Activated system prompt: {prompt.name} (ID: {prompt.id})")
         return {"prompt": prompt.model_dump(), "success": True, "message": f"Prompt '{prompt.name}' is now active"}
     
@@ -2086,9 +2870,10 @@ async def deactivate_system_prompt(prompt_id: str):
         raise HTTPException(status_code=404, detail=f"System prompt not found: {prompt_id}")
     
     prompt.is_active = False
-    prompt.updated_at = datetime.utcnow().isoformat()
+    prompt.updated_at = _now_iso()
     
     if save_system_prompt(prompt):
+        _write_active_pointer('')
         logger.info(f"Deactivated system prompt: {prompt.name} (ID: {prompt.id})")
         return {"prompt": prompt.model_dump(), "success": True, "message": "Prompt deactivated. Default prompt will be used."}
     
@@ -2103,58 +2888,133 @@ async def delete_system_prompt(prompt_id: str):
         raise HTTPException(status_code=404, detail=f"System prompt not found: {prompt_id}")
     
     if delete_system_prompt_file(prompt_id):
+        if prompt.is_active:
+            _write_active_pointer('')
         logger.info(f"Deleted system prompt: {prompt.name} (ID: {prompt.id})")
         return {"success": True, "message": f"Prompt '{prompt.name}' deleted"}
     
     raise HTTPException(status_code=500, detail="Failed to delete system prompt")
 
 
+# Parsed character cards keyed by path -> (mtime_ns, data). Cards change
+# rarely, so steady-state endpoint calls pay one stat() instead of a full
+# YAML parse per file.
+_yaml_cache: dict = {}
+_yaml_cache_lock = threading.Lock()
+
+
+def _load_yaml(path: Path):
+    """Parse a YAML file through the (path, mtime) cache; raises on failure"""
+    path_str = str(path)
+    mtime_ns = os.stat(path_str).st_mtime_ns
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(path_str)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+    with open(path_str, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    with _yaml_cache_lock:
+        _yaml_cache[path_str] = (mtime_ns, data)
+    return data
+
+
+def _character_files(characters_dir: Path) -> List[Path]:
+    """List character card files in one scandir pass (.yaml and .yml).
+
+    Replaces the double Path.glob, which walked the directory twice and
+    stat'ed every entry; DirEntry answers is_file() from the scandir data.
+    """
+    try:
+        with os.scandir(characters_dir) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith(('.yaml', '.yml'))
+                    and entry.is_file(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+# Character id -> card path, rebuilt only when a card file is added, removed
+# or touched. Lets the import endpoint open exactly one file instead of
+# parsing the whole directory per lookup.
+_char_index_cache = {"dir": None, "sig": None, "index": {}}
+_char_index_lock = threading.Lock()
+
+
+def _character_id_index(characters_dir: Path) -> dict:
+    """Map character card id -> file path, cached by directory mtime signature"""
+    try:
+        with os.scandir(characters_dir) as entries:
+            listing = sorted(
+                (entry.name, entry.stat().st_mtime_ns, entry.path)
+                for entry in entries
+                if entry.name.endswith(('.yaml', '.yml'))
+                and entry.is_file(follow_symlinks=False)
+            )
+    except OSError:
+        return {}
+
+    signature = tuple((name, mtime_ns) for name, mtime_ns, _ in listing)
+    with _char_index_lock:
+        if (signature == _char_index_cache["sig"]
+                and _char_index_cache["dir"] == characters_dir):
+            return _char_index_cache["index"]
+
+    index = {}
+    for _, _, entry_path in listing:
+        char_file = Path(entry_path)
+        try:
+            char_data = _load_yaml(char_file)
+        except yaml.YAMLError as e:
+            logger.warning(f"Could not parse character file {char_file}: {e}")
+            continue
+        if isinstance(char_data, dict):
+            index[char_data.get('id', char_file.stem)] = char_file
+
+    with _char_index_lock:
+        _char_index_cache["dir"] = characters_dir
+        _char_index_cache["sig"] = signature
+        _char_index_cache["index"] = index
+    return index
+
+
 @system_prompts_router.post("/import-character")
 async def import_character_as_prompt(import_data: CharacterCardImport):
     """Import a character card as a system prompt (future-proofed endpoint)"""
-    # This endpoint is prepared for future character card importing
-    # For now, it returns a not-implemented response
     character_id = import_data.character_id
-    
-    # Try to load character from characters directory
+
+    # O(1) lookup via the id index instead of parsing every card
     characters_dir = PROJECT_ROOT / 'frontend' / 'public' / 'characters'
-    character_files = list(characters_dir.glob('*.yaml')) + list(characters_dir.glob('*.yml'))
-    
-    for char_file in character_files:
-        try:
-            import yaml
-            with open(char_file, 'r', encoding='utf-8') as f:
-                char_data = yaml.safe_load(f)
-            
-            if char_data.get('id') == character_id:
-                # Found the character, create a prompt from it
-                system_prompt_content = char_data.get('system_prompt', '')
-                if not system_prompt_content:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Character '{character_id}' has no system_prompt defined"
-                    )
-                
-                prompt = SystemPrompt(
-                    name=import_data.name or f"Imported: {char_data.get('name', character_id)}",
-                    description=f"Imported from character card: {char_data.get('description', '')}",
-                    content=system_prompt_content,
-                    language=char_data.get('metadata', {}).get('language', 'sv'),
-                    tags=['imported', 'character-card', character_id],
-                    is_active=False
-                )
-                
-                if save_system_prompt(prompt):
-                    logger.info(f"Imported character '{character_id}' as system prompt: {prompt.name}")
-                    return {"prompt": prompt.model_dump(), "success": True}
-                
-                raise HTTPException(status_code=500, detail="Failed to save imported prompt")
-        
-        except yaml.YAMLError as e:
-            logger.warning(f"Could not parse character file {char_file}: {e}")
-            continue
-    
-    raise HTTPException(status_code=404, detail=f"Character not found: {character_id}")
+    char_file = _character_id_index(characters_dir).get(character_id)
+    if char_file is None:
+        raise HTTPException(status_code=404, detail=f"Character not found: {character_id}")
+
+    try:
+        char_data = _load_yaml(char_file)
+    except yaml.YAMLError as e:
+        logger.warning(f"Could not parse character file {char_file}: {e}")
+        raise HTTPException(status_code=404, detail=f"Character not found: {character_id}")
+
+    system_prompt_content = char_data.get('system_prompt', '')
+    if not system_prompt_content:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Character '{character_id}' has no system_prompt defined"
+        )
+
+    prompt = SystemPrompt(
+        name=import_data.name or f"Imported: {char_data.get('name', character_id)}",
+        description=f"Imported from character card: {char_data.get('description', '')}",
+        content=system_prompt_content,
+        language=char_data.get('metadata', {}).get('language', 'sv'),
+        tags=['imported', 'character-card', character_id],
+        is_active=False
+    )
+
+    if save_system_prompt(prompt):
+        logger.info(f"Imported character '{character_id}' as system prompt: {prompt.name}")
+        return {"prompt": prompt.model_dump(), "success": True}
+
+    raise HTTPException(status_code=500, detail="Failed to save imported prompt")
 
 
 def sync_character_cards_to_prompts() -> dict:
@@ -2171,15 +3031,26 @@ def sync_character_cards_to_prompts() -> dict:
         logger.warning(f"Characters directory not found: {characters_dir}")
         return results
     
-    character_files = list(characters_dir.glob('*.yaml')) + list(characters_dir.glob('*.yml'))
+    character_files = _character_files(characters_dir)
     existing_prompts = load_all_system_prompts()
-    
+
+    # Collect already-imported character ids once; the per-file any() scan
+    # over all prompts was O(files x prompts)
+    imported_character_ids = {
+        tag
+        for p in existing_prompts if 'character-card' in p.tags
+        for tag in p.tags if tag != 'character-card'
+    }
+
+    # Prompts to create, written concurrently after validation - on a first
+    # startup with many cards this turns N sequential file creations into
+    # pool-parallel writes
+    to_write: List[tuple] = []
+
     for char_file in character_files:
         try:
-            import yaml
-            with open(char_file, 'r', encoding='utf-8') as f:
-                char_data = yaml.safe_load(f)
-            
+            char_data = _load_yaml(char_file)
+
             # Validate char_data structure
             if not isinstance(char_data, dict):
                 results["errors"].append({
@@ -2242,19 +3113,14 @@ def sync_character_cards_to_prompts() -> dict:
                 continue
             
             # Check if already imported (by checking if a prompt with this character-card tag exists)
-            already_imported = any(
-                character_id in p.tags and 'character-card' in p.tags 
-                for p in existing_prompts
-            )
-            
-            if already_imported:
+            if character_id in imported_character_ids:
                 results["skipped"].append({
                     "id": character_id,
                     "reason": "Already imported"
                 })
                 continue
             
-            # Create and save the prompt
+            # Create the prompt; writes are batched after the loop
             prompt = SystemPrompt(
                 name=char_data.get('name', character_id),
                 description=char_data.get('description', ''),
@@ -2263,27 +3129,32 @@ def sync_character_cards_to_prompts() -> dict:
                 tags=['character-card', character_id, char_data.get('personality_type', 'default')],
                 is_active=False
             )
-            
-            if save_system_prompt(prompt):
-                results["synced"].append({
-                    "id": character_id,
-                    "name": prompt.name,
-                    "prompt_id": prompt.id
-                })
-                logger.info(f"Synced character card '{character_id}' as system prompt: {prompt.name}")
-            else:
-                results["errors"].append({
-                    "id": character_id,
-                    "error": "Failed to save"
-                })
-                
+            to_write.append((character_id, prompt))
+
         except Exception as e:
             results["errors"].append({
                 "id": char_file.stem,
                 "error": str(e)
             })
             logger.warning(f"Could not sync character file {char_file}: {e}")
-    
+
+    if to_write:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            saved = pool.map(save_system_prompt, (p for _, p in to_write))
+            for (character_id, prompt), ok in zip(to_write, saved):
+                if ok:
+                    results["synced"].append({
+                        "id": character_id,
+                        "name": prompt.name,
+                        "prompt_id": prompt.id
+                    })
+                    logger.info(f"Synced character card '{character_id}' as system prompt: {prompt.name}")
+                else:
+                    results["errors"].append({
+                        "id": character_id,
+                        "error": "Failed to save"
+                    })
+
     return results
 
 
@@ -2311,25 +3182,26 @@ async def list_available_characters():
     characters_dir = PROJECT_ROOT / 'frontend' / 'public' / 'characters'
     characters = []
     
-    # Get existing prompts to check sync status
+    # Get existing prompts to check sync status, indexed by character id so
+    # the per-card lookup below is a dict get instead of a prompt scan
     existing_prompts = load_all_system_prompts()
-    
+    char_to_prompt = {
+        tag: p
+        for p in existing_prompts if 'character-card' in p.tags
+        for tag in p.tags if tag != 'character-card'
+    }
+
     if characters_dir.exists():
-        character_files = list(characters_dir.glob('*.yaml')) + list(characters_dir.glob('*.yml'))
-        
+        character_files = _character_files(characters_dir)
+
         for char_file in character_files:
             try:
-                import yaml
-                with open(char_file, 'r', encoding='utf-8') as f:
-                    char_data = yaml.safe_load(f)
-                
+                char_data = _load_yaml(char_file)
+
                 character_id = char_data.get('id', char_file.stem)
                 
                 # Check if already synced
-                synced_prompt = next(
-                    (p for p in existing_prompts if character_id in p.tags and 'character-card' in p.tags),
-                    None
-                )
+                synced_prompt = char_to_prompt.get(character_id)
                 
                 characters.append({
                     "id": character_id,
@@ -2899,9 +3771,29 @@ async def update_open_data_api(api_id: str, request: dict):
 # =============================================================================
 
 
+# Model layout is static within a process, so discovery results are memoized:
+# dual-model init calls these repeatedly and would otherwise redo the whole
+# stat/scandir walk each time. The lru_cache also makes the discovery logs
+# one-shot instead of repeating on every load.
+def _invalidate_model_path_cache():
+    """Clear memoized model/adapter discovery (tests and live reloads)"""
+    find_base_model_path.cache_clear()
+    find_lora_weights.cache_clear()
+
+
+def _has(dirpath, filename) -> bool:
+    """One-stat probe for a known filename inside a directory.
+
+    Cheaper than (path / filename).exists(): no intermediate Path object,
+    and isfile covers the does-the-directory-exist question too.
+    """
+    return os.path.isfile(os.path.join(str(dirpath), filename))
+
+
+@lru_cache(maxsize=1)
 def find_base_model_path():
     """Find a valid base model path for OneSeek-7B-Zero
-    
+
     Checks in this order:
     1. Model specified in metadata (actual trained model)
     2. oneseek-7b-zero directory itself (if it has config.json - fully trained model)
@@ -2913,8 +3805,9 @@ def find_base_model_path():
         return metadata_base_model
     
     # SECOND: Check if OneSeek directory itself has a config.json (complete model)
+    # isfile on the config probes directory + file in one stat
     base_path = Path(ONESEEK_PATH)
-    if (base_path / 'config.json').exists():
+    if _has(ONESEEK_PATH, 'config.json'):
         logger.info(f"Found complete OneSeek model at {base_path}")
         return str(base_path)
     
@@ -2930,7 +3823,9 @@ def find_base_model_path():
     kb_llama_path = PROJECT_ROOT / 'models' / 'KB-Llama-3.1-8B-Swedish'
     kb_llama_alt = PROJECT_ROOT / 'models' / 'kb-llama-3-1-8b-swedish'
     
-    # Check each path for config.json - prioritize KB-Llama since it's commonly used
+    # Check each path for config.json - prioritize KB-Llama since it's commonly
+    # used. A single isfile on the config covers the directory check too,
+    # halving the stat calls per candidate.
     for name, path in [
         ('KB-Llama-3.1-8B-Swedish', kb_llama_path),
         ('KB-Llama-3.1-8B-Swedish (lowercase)', kb_llama_alt),
@@ -2939,25 +3834,32 @@ def find_base_model_path():
         ('Mistral-7B (legacy)', legacy_mistral),
         ('LLaMA-2-7B (legacy)', legacy_llama)
     ]:
-        if path.exists() and (path / 'config.json').exists():
+        if _has(path, 'config.json'):
             logger.info(f"Found base model: {name} at {path}")
             return str(path)
-    
-    # Also search for any model with config.json in the models directory
+
+    # Also search for any model with config.json in the models directory.
+    # scandir's DirEntry answers is_dir() from the directory read itself,
+    # so the walk costs one stat per candidate (the config probe) instead
+    # of three per entry with iterdir + exists.
     models_dir = PROJECT_ROOT / 'models'
     if models_dir.exists():
         logger.info("Searching for any base model in models directory...")
-        for item in models_dir.iterdir():
-            if item.is_dir() and item.name not in ['oneseek-7b-zero', 'oneseek-certified', 'backups']:
-                if (item / 'config.json').exists():
-                    logger.info(f"Found base model by search: {item.name} at {item}")
-                    return str(item)
-    
+        skip_dirs = {'oneseek-7b-zero', 'oneseek-certified', 'backups'}
+        with os.scandir(models_dir) as entries:
+            for entry in entries:
+                if (entry.name not in skip_dirs
+                        and entry.is_dir(follow_symlinks=False)
+                        and os.path.isfile(os.path.join(entry.path, 'config.json'))):
+                    logger.info(f"Found base model by search: {entry.name} at {entry.path}")
+                    return entry.path
+
     return None
 
+@lru_cache(maxsize=8)
 def find_lora_weights(adapter_suffix=''):
     """Find the latest LoRA adapter weights for OneSeek-7B-Zero
-    
+
     Args:
         adapter_suffix: Optional suffix like 'mistral' or 'llama' for model-specific adapters
     
@@ -2967,7 +3869,6 @@ def find_lora_weights(adapter_suffix=''):
     
     Returns path to LoRA weights file or directory, or None if not found
     """
-    import json
     base_path = Path(ONESEEK_PATH)
     
     # Check if we're in a certified directory
@@ -2979,15 +3880,14 @@ def find_lora_weights(adapter_suffix=''):
         metadata_file = base_path / 'metadata.json'
         if metadata_file.exists():
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                metadata = _read_json_cached(metadata_file)
                 adapters = metadata.get('adapters', [])
                 if adapters:
                     # Use the latest adapter (last in list)
                     latest_adapter_path = adapters[-1]
                     # Adapters are stored relative to the certified model directory
                     full_adapter_path = base_path / latest_adapter_path
-                    if full_adapter_path.exists() and (full_adapter_path / 'adapter_config.json').exists():
+                    if _has(full_adapter_path, 'adapter_config.json'):
                         logger.info(f"Found LoRA adapter from metadata: {full_adapter_path}")
                         return str(full_adapter_path)
                     else:
@@ -2999,28 +3899,40 @@ def find_lora_weights(adapter_suffix=''):
         for item in base_path.iterdir():
             if item.is_dir() and '-adapter' in item.name:
                 # Check for PEFT format
-                if (item / 'adapter_config.json').exists():
+                if _has(item, 'adapter_config.json'):
                     logger.info(f"Found PEFT LoRA adapter in certified directory: {item}")
                     return str(item)
         
-        # Check lora_adapters subdirectory
+        # Check lora_adapters subdirectory - one scandir pass, mtime from the
+        # DirEntry stat cache instead of a separate stat per candidate
         lora_adapters_dir = base_path / 'lora_adapters'
         if lora_adapters_dir.exists():
-            # Find all adapter directories
-            adapter_dirs = [d for d in lora_adapters_dir.iterdir() if d.is_dir() and (d / 'adapter_config.json').exists()]
-            if adapter_dirs:
-                # Sort by modification time (newest first) and use the latest
-                latest_adapter = max(adapter_dirs, key=lambda p: p.stat().st_mtime)
+            latest_adapter, latest_mtime = None, -1.0
+            with os.scandir(lora_adapters_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if not _has(entry.path, 'adapter_config.json'):
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_adapter, latest_mtime = entry.path, mtime
+            if latest_adapter is not None:
                 logger.info(f"Found PEFT LoRA adapter in lora_adapters: {latest_adapter}")
-                return str(latest_adapter)
+                return latest_adapter
         
-        # Look for .pth weight files
-        pth_files = list(base_path.glob('*.pth'))
-        if pth_files:
-            # Sort by modification time, use latest
-            latest_pth = max(pth_files, key=lambda p: p.stat().st_mtime)
+        # Look for .pth weight files - one scandir pass, mtime taken from the
+        # DirEntry stat cache instead of re-stat'ing each match
+        latest_pth, latest_mtime = None, -1.0
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pth') and entry.is_file(follow_symlinks=False):
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_pth, latest_mtime = entry.path, mtime
+        if latest_pth is not None:
             logger.info(f"Found weight file in certified directory: {latest_pth}")
-            return str(latest_pth)
+            return latest_pth
         
         logger.info(f"No LoRA adapters found in certified directory - using base model")
         return None
@@ -3039,7 +3951,14 @@ def find_lora_weights(adapter_suffix=''):
                 target_model = base_models[0]
                 normalized_model = normalize_model_name_for_lookup(target_model)
                 
-                # Look for matching key in modelSpecificWeights
+                # Look for matching key in modelSpecificWeights - exact dict
+                # lookup first so the common case never runs a substring scan
+                exact_file = model_specific_weights.get(normalized_model)
+                if exact_file is not None:
+                    weight_path = base_path / 'weights' / exact_file
+                    if weight_path.exists():
+                        logger.info(f"Found model-specific LoRA weights from metadata: {weight_path}")
+                        return str(weight_path)
                 for key, weight_file in model_specific_weights.items():
                     if normalized_model in key or key in normalized_model:
                         weight_path = base_path / 'weights' / weight_file
@@ -3055,43 +3974,191 @@ def find_lora_weights(adapter_suffix=''):
         adapter_dir = lora_dir / f'{adapter_suffix}-adapter'
         if adapter_dir.exists():
             # PEFT format - return directory path
-            if (adapter_dir / 'adapter_config.json').exists():
+            if _has(adapter_dir, 'adapter_config.json'):
                 logger.info(f"Found PEFT LoRA adapter directory: {adapter_dir}")
                 return str(adapter_dir)
             # Legacy format - check for adapter.pth
-            elif (adapter_dir / 'adapter.pth').exists():
+            elif _has(adapter_dir, 'adapter.pth'):
                 logger.info(f"Found legacy LoRA adapter: {adapter_dir / 'adapter.pth'}")
                 return str(adapter_dir / 'adapter.pth')
     
     # Check weights directory for .pth files (legacy fallback)
     weights_dir = base_path / 'weights'
     if weights_dir.exists():
-        # Find all version files
-        weight_files = list(weights_dir.glob('oneseek-7b-zero-v*.pth'))
-        if weight_files:
-            # Sort by version number and get the latest
-            latest_weight = sorted(weight_files, reverse=True)[0]
+        # Latest version file by name, found in a single scandir pass
+        # (glob would fnmatch and allocate a Path per entry)
+        latest_name = None
+        with os.scandir(weights_dir) as entries:
+            for entry in entries:
+                if (entry.name.startswith('oneseek-7b-zero-v')
+                        and entry.name.endswith('.pth')
+                        and (latest_name is None or entry.name > latest_name)):
+                    latest_name = entry.name
+        if latest_name is not None:
+            latest_weight = weights_dir / latest_name
             logger.info(f"Found LoRA weights (latest): {latest_weight}")
             return str(latest_weight)
-    
+
     # Check lora_adapters directory for versioned adapters
     lora_dir = base_path / 'lora_adapters'
     if lora_dir.exists():
-        adapter_dirs = list(lora_dir.glob('oneseek-7b-zero-v*'))
-        for adapter_dir in sorted(adapter_dirs, reverse=True):
-            # Check for PEFT format
-            if (adapter_dir / 'adapter_config.json').exists():
-                logger.info(f"Found PEFT LoRA adapter directory: {adapter_dir}")
-                return str(adapter_dir)
-            # Check for legacy format
-            adapter_file = adapter_dir / 'adapter.pth'
-            if adapter_file.exists():
-                logger.info(f"Found legacy LoRA adapter: {adapter_file}")
-                return str(adapter_file)
-    
+        # Latest usable adapter via max() over a filter instead of a full
+        # reverse sort; a dir is usable in PEFT or legacy format
+        with os.scandir(lora_dir) as entries:
+            versioned = [entry.name for entry in entries
+                         if entry.name.startswith('oneseek-7b-zero-v')
+                         and entry.is_dir(follow_symlinks=False)]
+        latest_name = max(
+            (name for name in versioned
+             if _has(lora_dir / name, 'adapter_config.json') or _has(lora_dir / name, 'adapter.pth')),
+            default=None
+        )
+        if latest_name is not None:
+            latest_adapter = lora_dir / latest_name
+            if _has(latest_adapter, 'adapter_config.json'):
+                logger.info(f"Found PEFT LoRA adapter directory: {latest_adapter}")
+                return str(latest_adapter)
+            adapter_file = latest_adapter / 'adapter.pth'
+            logger.info(f"Found legacy LoRA adapter: {adapter_file}")
+            return str(adapter_file)
+
     return None
 
+# =============================================================================
+# OPTIONAL vLLM BACKEND - continuous batching + PagedAttention (CUDA only)
+# =============================================================================
+# Enabled via --use-vllm. Under concurrent load the HF generate path
+# serializes requests against the GPU; vLLM batches in-flight requests
+# continuously and pages the KV cache, multiplying tokens/sec with
+# concurrency. Falls back to the HF path when vLLM is unavailable.
+
+_vllm_engine = None
+_vllm_init_failed = False
+
+
+def get_vllm_engine():
+    """
+    Lazily create the vLLM AsyncLLMEngine for the active model.
+
+    Returns the engine, or None if vLLM is not installed or engine init
+    failed (in which case the HF generate path is used instead).
+    """
+    global _vllm_engine, _vllm_init_failed
+    if _vllm_engine is not None or _vllm_init_failed:
+        return _vllm_engine
+
+    with _model_load_locks['vllm-engine']:
+        if _vllm_engine is not None or _vllm_init_failed:
+            return _vllm_engine
+        try:
+            from vllm import AsyncLLMEngine
+            from vllm.engine.arg_utils import AsyncEngineArgs
+
+            engine_args = AsyncEngineArgs(
+                model=ONESEEK_PATH,
+                dtype='bfloat16' if torch.cuda.is_bf16_supported() else 'float16',
+                max_num_seqs=32,
+                enable_prefix_caching=True,
+                tensor_parallel_size=args.tensor_parallel or max(torch.cuda.device_count(), 1),
+            )
+            _vllm_engine = AsyncLLMEngine.from_engine_args(engine_args)
+            logger.info("✓ vLLM backend active (continuous batching + PagedAttention)")
+        except ImportError:
+            logger.warning("⚠ --use-vllm requested but vllm is not installed - using HF generate path")
+            logger.warning("  Install with: pip install vllm")
+            _vllm_init_failed = True
+        except Exception as e:
+            logger.warning(f"⚠ vLLM engine init failed: {e} - using HF generate path")
+            _vllm_init_failed = True
+    return _vllm_engine
+
+
+async def vllm_generate(prompt: str, max_new_tokens: int, temperature: float, top_p: float):
+    """
+    Run one generation through the vLLM engine.
+
+    Returns (response_text, token_count). Sampling params mirror the HF
+    path including the greedy fast path for temperature=0.
+    """
+    from vllm import SamplingParams
+
+    params = SamplingParams(
+        temperature=temperature if temperature > 0 else 0.0,
+        top_p=top_p if temperature > 0 else 1.0,
+        max_tokens=max_new_tokens,
+    )
+
+    final_output = None
+    async for output in _vllm_engine.generate(prompt, params, request_id=uuid.uuid4().hex):
+        final_output = output
+
+    completion = final_output.outputs[0]
+    return completion.text, len(completion.token_ids)
+
+
+async def vllm_stream(prompt: str, max_new_tokens: int, temperature: float, top_p: float):
+    """
+    Stream one generation through the vLLM engine, yielding text deltas.
+
+    The engine reports the cumulative completion on every step, so only the
+    newly generated suffix is yielded - already token-incremental, no
+    TextIteratorStreamer/thread needed on this path.
+    """
+    from vllm import SamplingParams
+
+    params = SamplingParams(
+        temperature=temperature if temperature > 0 else 0.0,
+        top_p=top_p if temperature > 0 else 1.0,
+        max_tokens=max_new_tokens,
+    )
+
+    sent = 0
+    async for output in _vllm_engine.generate(prompt, params, request_id=uuid.uuid4().hex):
+        text = output.outputs[0].text
+        if len(text) > sent:
+            yield text[sent:]
+            sent = len(text)
+
+
+def use_vllm_backend() -> bool:
+    """True when inference should go through the vLLM engine."""
+    return args.use_vllm and DEVICE_TYPE == 'cuda' and get_vllm_engine() is not None
+
+
+# =============================================================================
+# END OPTIONAL vLLM BACKEND
+# =============================================================================
+
+
+# Guards the model cache against concurrent cold loads: two simultaneous
+# requests must not both call from_pretrained (each would allocate a full
+# model before one "wins" the cache slot). Per-model locks, so the dual-model
+# path can load Mistral and LLaMA concurrently while same-model loads still
+# collapse into one.
+_model_load_locks = defaultdict(threading.Lock)
+
+
 def load_model(model_name: str, model_path: str):
+    """
+    Thread-safe entry point for loading models.
+
+    Uses double-checked locking around the models/tokenizers cache so that
+    concurrent cold requests trigger exactly one from_pretrained call -
+    without this, two cold requests each allocate a full ~14 GB model.
+    """
+    if model_name in models:
+        return _touch_model(model_name)
+    with _model_load_locks[model_name]:
+        # Re-check after acquiring: another request may have finished
+        # loading while we waited for the lock
+        if model_name in models:
+            return _touch_model(model_name)
+        result = _load_model_impl(model_name, model_path)
+        last_used[model_name] = time.monotonic()
+        return result
+
+
+def _load_model_impl(model_name: str, model_path: str):
     """Load model and tokenizer with device optimization, applying LoRA adapters if available"""
     logger.debug(f"→ load_model called: model_name={model_name}")
     logger.debug(f"→ model_path parameter: {model_path}")
@@ -3137,15 +4204,68 @@ def load_model(model_name: str, model_path: str):
             logger.info(f"Loading OneSeek-7B-Zero using base model from {model_path}...")
     else:
         logger.info(f"Loading {model_name} from {model_path}...")
-    
+
+    # ONNX Runtime DirectML backend: ORT's DML execution provider has a much
+    # more mature kernel set for AMD iGPUs than torch-directml. The export is
+    # a one-off, cached in an onnx/ directory next to the weights; the ORT
+    # wrapper is generate()-compatible so the serving paths are unchanged.
+    # Any failure falls back to the torch-directml path below.
+    if args.onnx_dml and DEVICE_TYPE == 'directml':
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM
+
+            onnx_dir = Path(model_path) / 'onnx'
+            if onnx_dir.is_dir() and next(onnx_dir.glob('*.onnx'), None) is not None:
+                logger.info(f"Loading cached ONNX export from {onnx_dir}")
+                model = ORTModelForCausalLM.from_pretrained(
+                    str(onnx_dir), provider='DmlExecutionProvider')
+            else:
+                logger.info("Exporting model to ONNX for DirectML (one-off, cached for later starts)...")
+                model = ORTModelForCausalLM.from_pretrained(
+                    model_path, export=True, provider='DmlExecutionProvider')
+                try:
+                    model.save_pretrained(str(onnx_dir))
+                except Exception as e:
+                    logger.warning(f"⚠ Could not cache ONNX export: {e}")
+
+            tokenizer = AutoTokenizer.from_pretrained(
+                model_path, use_fast=True, local_files_only=True)
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+                tokenizer.pad_token_id = tokenizer.eos_token_id
+            model._pad_id = tokenizer.pad_token_id
+            model._eos_id = tokenizer.eos_token_id
+
+            models[model_name] = model
+            tokenizers[model_name] = tokenizer
+            # ORT feeds from host tensors; pointing the cached device at CPU
+            # turns move_inputs into a no-op for this backend
+            global MODEL_DEVICE
+            MODEL_DEVICE = torch.device('cpu')
+            logger.info(f"✓ {model_name} serving via ONNX Runtime (DmlExecutionProvider)")
+            return model, tokenizer
+        except ImportError:
+            logger.warning("⚠ --onnx-dml requires optimum[onnxruntime-directml] - falling back to torch-directml")
+        except Exception as e:
+            logger.warning(f"⚠ ONNX Runtime DirectML backend unavailable ({e}) - falling back to torch-directml")
+
     # Determine dtype based on device and flags
-    # Use bfloat16 for DirectML/GPU (better performance on AMD Ryzen AI)
-    # Use float16 for CUDA/XPU
-    # Use float32 for CPU
-    if args.auto_devices and DEVICE_TYPE == 'directml':
+    # BF16 is the default: half the weight bytes of FP32 (decode is memory-
+    # bound, so ~2x tok/s) with the full FP32 exponent range, so no
+    # overflow-induced NaN during attention
+    # Use float16 on pre-Ampere CUDA and DirectML (no BF16 kernels there)
+    # CPU keeps float32 - BF16 CPU kernels are slower than FP32 on most chips
+    if DEVICE_TYPE == 'directml':
         dtype = torch.float16
-        logger.info("Using torch.bfloat16 for optimal Ryzen AI Max 390 performance")
-    elif DEVICE_TYPE in ['cuda', 'xpu', 'directml']:
+        if args.auto_devices:
+            logger.info("Using torch.float16 for optimal Ryzen AI Max 390 performance")
+    elif DEVICE_TYPE == 'cuda' and torch.cuda.is_bf16_supported():
+        dtype = torch.bfloat16
+        logger.info("Using torch.bfloat16 (Ampere+ GPU detected)")
+    elif DEVICE_TYPE == 'xpu':
+        dtype = torch.bfloat16
+        logger.info("Using torch.bfloat16 (Intel Xe supports BF16 natively)")
+    elif DEVICE_TYPE == 'cuda':
         dtype = torch.float16
     else:
         dtype = torch.float32
@@ -3157,184 +4277,297 @@ def load_model(model_name: str, model_path: str):
         'trust_remote_code': True,
     }
     
+    # Select the attention kernel explicitly on CUDA - without this,
+    # transformers may pick the math SDPA backend which traverses the K/V
+    # tensors multiple times. FlashAttention-2 needs compute capability >= 8.0
+    # and the flash-attn package; otherwise fall back to the fused sdpa kernel.
+    if DEVICE_TYPE == 'cuda':
+        attn_impl = 'sdpa'
+        if torch.cuda.get_device_capability(0)[0] >= 8:
+            try:
+                import flash_attn  # noqa: F401
+                attn_impl = 'flash_attention_2'
+            except ImportError:
+                logger.info("flash-attn not installed - using sdpa attention backend")
+        model_kwargs['attn_implementation'] = attn_impl
+        logger.info(f"Attention implementation: {attn_impl}")
+    elif DEVICE_TYPE == 'xpu':
+        # IPEX ships a fused SDPA kernel; eager attention would traverse the
+        # K/V tensors multiple times. DirectML stays on the default (its
+        # backend decomposes SDPA anyway).
+        model_kwargs['attn_implementation'] = 'sdpa'
+        logger.info("Attention implementation: sdpa")
+
     # Add device_map and offloading if auto-devices is enabled
     if args.auto_devices:
         model_kwargs['device_map'] = 'auto'
         model_kwargs['offload_folder'] = 'offload'
         model_kwargs['offload_state_dict'] = True
         logger.info("Using device_map='auto' for GPU/NPU offloading")
-    
-    # Add quantization if requested
-    if args.load_in_4bit:
+        if DEVICE_TYPE == 'cuda' and torch.cuda.device_count() > 1:
+            # device_map='auto' pipelines layers across GPUs (one active at a
+            # time) - for true tensor parallelism use --use-vllm --tensor-parallel
+            logger.info(f"Multi-GPU box detected ({torch.cuda.device_count()} GPUs): "
+                        "consider --use-vllm --tensor-parallel for tensor parallelism")
+    
+    # Add quantization if requested. Decode on a 7B model is memory-bandwidth
+    # bound, so proper weight-only kernels (AWQ/GPTQ W4A16) roughly double
+    # decode throughput; bitsandbytes int8/nf4 dequantizes on the fly and is
+    # typically slower than fp16 for this workload, so it stays only as the
+    # legacy memory-saving option.
+    if args.quantization == 'awq':
         try:
-            from transformers import BitsAndBytesConfig
+            from transformers import AwqConfig
+            model_kwargs['quantization_config'] = AwqConfig(
+                bits=4,
+                group_size=128,
+                version='gemm',
+            )
+            logger.info("Loading model with AWQ 4-bit weight-only quantization")
+        except ImportError:
+            logger.warning("autoawq not installed - ignoring --quantization awq")
+    elif args.quantization == 'gptq':
+        try:
+            from transformers import GPTQConfig
+            model_kwargs['quantization_config'] = GPTQConfig(bits=4)
+            logger.info("Loading model with GPTQ 4-bit weight-only quantization")
+        except ImportError:
+            logger.warning("optimum/auto-gptq not installed - ignoring --quantization gptq")
+    elif args.load_in_4bit:
+        if BitsAndBytesConfig is not None:
             model_kwargs['quantization_config'] = BitsAndBytesConfig(
                 load_in_4bit=True,
                 bnb_4bit_compute_dtype=dtype,
                 bnb_4bit_use_double_quant=True,
             )
             logger.info("Loading model in 4-bit quantization")
-        except ImportError:
+        else:
             logger.warning("bitsandbytes not installed - ignoring 4-bit quantization")
     elif args.load_in_8bit:
         model_kwargs['load_in_8bit'] = True
         logger.info("Loading model in 8-bit quantization")
-    
+
+    # Finalize loading kwargs here so the weight load can start in the
+    # background while the tokenizer strategies run - streaming ~14 GB of
+    # shards takes tens of seconds and needs nothing from the tokenizer
+    model_path_obj = Path(model_path)
+
+    # Parse config.json exactly once up front. The pre-built LlamaConfig is
+    # handed to both from_pretrained calls below so neither re-opens and
+    # re-parses the same file internally.
+    config_path = model_path_obj / "config.json"
+    model_type = None
+    config_dict = None
+    if config_path.exists():
+        try:
+            # orjson-backed read (bytes in, no Python-side UTF-8 decode)
+            config_dict = _read_json(config_path)
+            model_type = config_dict.get('model_type', None)
+            if model_type:
+                logger.info(f"✓ Found model_type in config.json: {model_type}")
+        except Exception as e:
+            logger.warning(f"Could not read config.json: {e}")
+
+    llama_config = None
+    if model_type == 'llama' and config_dict:
+        try:
+            from transformers import LlamaConfig
+            llama_config = LlamaConfig(**config_dict)
+            logger.info("✓ Pre-loaded LlamaConfig successfully")
+        except Exception as e:
+            logger.warning(f"Could not pre-load LlamaConfig: {e}")
+    if llama_config is not None:
+        model_kwargs['config'] = llama_config
+
+    # Stream weights straight from safetensors via mmap when available -
+    # avoids materializing each shard in host RAM before the device copy,
+    # roughly halving peak host memory and cold-start time
+    if next(model_path_obj.glob('*.safetensors'), None) is not None:
+        model_kwargs['use_safetensors'] = True
+
+    # With a known target device, let from_pretrained place weights
+    # directly instead of loading on CPU and calling .to(DEVICE) after -
+    # the CPU-then-copy route doubles peak host RAM and adds a full H2D
+    # transfer of the weights. DirectML stays on the .to() path (accelerate
+    # has no placement support for privateuseone devices).
+    if 'device_map' not in model_kwargs and DEVICE_TYPE in ('cuda', 'xpu', 'cpu'):
+        model_kwargs['device_map'] = {
+            'cuda': {'': 0},
+            'xpu': {'': 'xpu'},
+            'cpu': {'': 'cpu'},
+        }[DEVICE_TYPE]
+
+    start_time = time.time()
+    logger.info(f"Loading OneSeek-7B-Zero with chained LoRA adapters...")
+    logger.info("Loading checkpoint shards...")
+    weights_executor = ThreadPoolExecutor(max_workers=1)
+    model_future = weights_executor.submit(
+        AutoModelForCausalLM.from_pretrained, model_path, **model_kwargs
+    )
+
     try:
         # Load tokenizer with config-fix to handle malformed config.json files
         # This fixes the "'dict' object has no attribute 'model_type'" error
-        import json
         from transformers import PretrainedConfig
-        
+
         logger.info(f"Loading tokenizer from: {model_path}")
         tokenizer = None
         tokenizer_errors = []
-        model_path_obj = Path(model_path)
-        
-        # Read model_type from config.json to understand model architecture
-        config_path = model_path_obj / "config.json"
-        model_type = None
-        config_dict = None
-        if config_path.exists():
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config_dict = json.load(f)
-                model_type = config_dict.get('model_type', None)
-                if model_type:
-                    logger.info(f"✓ Found model_type in config.json: {model_type}")
-            except Exception as e:
-                logger.warning(f"Could not read config.json: {e}")
-        
+
         # Read tokenizer class from tokenizer_config.json
         tokenizer_config_path = model_path_obj / "tokenizer_config.json"
         tokenizer_class_name = None
         if tokenizer_config_path.exists():
             try:
-                with open(tokenizer_config_path, 'r', encoding='utf-8') as f:
-                    tokenizer_config = json.load(f)
+                tokenizer_config = _read_json(tokenizer_config_path)
                 tokenizer_class_name = tokenizer_config.get('tokenizer_class', None)
                 if tokenizer_class_name:
                     logger.info(f"✓ Found tokenizer_class in tokenizer_config.json: {tokenizer_class_name}")
             except Exception as e:
                 logger.warning(f"Could not read tokenizer_config.json: {e}")
         
-        # Strategy 1: For PreTrainedTokenizerFast, try loading directly from tokenizer.json
-        # This bypasses config.json entirely and avoids the 'dict has no attribute model_type' error
-        if tokenizer is None and tokenizer_class_name == 'PreTrainedTokenizerFast':
-            tokenizer_json_path = model_path_obj / "tokenizer.json"
-            if tokenizer_json_path.exists():
-                try:
+        # Fast path: one config-driven attempt. tokenizer_config.json already
+        # told us the class, so dispatch to exactly one loader instead of
+        # walking the recovery cascade (each failed attempt re-reads the
+        # directory and builds a full traceback). ONESEEK_TOKENIZER_RECOVERY=1
+        # forces the cascade for corrupt-repo debugging; a failed fast attempt
+        # also falls through to it rather than aborting the load.
+        recovery_mode = os.environ.get('ONESEEK_TOKENIZER_RECOVERY') == '1'
+
+        if not recovery_mode:
+            try:
+                if (tokenizer_class_name == 'PreTrainedTokenizerFast'
+                        and (model_path_obj / "tokenizer.json").exists()):
+                    # Bypasses config.json entirely and avoids the
+                    # 'dict has no attribute model_type' error
                     from transformers import PreTrainedTokenizerFast
                     tokenizer = PreTrainedTokenizerFast(
-                        tokenizer_file=str(tokenizer_json_path),
+                        tokenizer_file=str(model_path_obj / "tokenizer.json"),
                         bos_token="<|begin_of_text|>",
                         eos_token="<|end_of_text|>",
                         pad_token="<|end_of_text|>",
                     )
                     logger.info("✓ Tokenizer loaded directly from tokenizer.json")
-                except Exception as e0:
-                    tokenizer_errors.append(f"PreTrainedTokenizerFast from tokenizer.json: {e0}")
-        
-        # Strategy 2: For llama models, pre-load config as LlamaConfig
-        llama_config = None
-        if model_type == 'llama' and config_dict:
-            try:
-                from transformers import LlamaConfig
-                llama_config = LlamaConfig(**config_dict)
-                logger.info("✓ Pre-loaded LlamaConfig successfully")
-            except Exception as e:
-                logger.warning(f"Could not pre-load LlamaConfig: {e}")
-        
-        # Strategy 3: Try with LlamaConfig if available
-        if tokenizer is None and llama_config is not None:
-            try:
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_path, 
-                    config=llama_config,
-                    trust_remote_code=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with LlamaConfig")
-            except Exception as e1:
-                tokenizer_errors.append(f"with LlamaConfig: {e1}")
-        
-        # Strategy 4: Try AutoTokenizer with defaults (best compatibility)
-        if tokenizer is None:
-            try:
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_path, 
-                    trust_remote_code=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with AutoTokenizer (defaults)")
-            except Exception as e2:
-                tokenizer_errors.append(f"AutoTokenizer (defaults): {e2}")
-        
-        # Strategy 5: Try with use_fast=True
-        if tokenizer is None:
-            try:
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_path, 
-                    trust_remote_code=True,
-                    use_fast=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with use_fast=True")
-            except Exception as e3:
-                tokenizer_errors.append(f"use_fast=True: {e3}")
-        
-        # Strategy 6: Try with use_fast=False
-        if tokenizer is None:
-            try:
-                tokenizer = AutoTokenizer.from_pretrained(
-                    model_path, 
-                    trust_remote_code=True,
-                    use_fast=False,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with use_fast=False")
-            except Exception as e4:
-                tokenizer_errors.append(f"use_fast=False: {e4}")
-        
-        # Strategy 7: Try PreTrainedTokenizerFast.from_pretrained
-        if tokenizer is None:
-            try:
-                from transformers import PreTrainedTokenizerFast
-                tokenizer = PreTrainedTokenizerFast.from_pretrained(
-                    model_path,
-                    trust_remote_code=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with PreTrainedTokenizerFast.from_pretrained")
-            except Exception as e5:
-                tokenizer_errors.append(f"PreTrainedTokenizerFast.from_pretrained: {e5}")
-        
-        # Strategy 8: Try LlamaTokenizerFast (only for llama models)
-        if tokenizer is None and model_type and 'llama' in model_type.lower():
-            try:
-                from transformers import LlamaTokenizerFast
-                tokenizer = LlamaTokenizerFast.from_pretrained(
-                    model_path,
-                    trust_remote_code=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with LlamaTokenizerFast")
-            except Exception as e6:
-                tokenizer_errors.append(f"LlamaTokenizerFast: {e6}")
-        
-        # Strategy 9: Try LlamaTokenizer (only for llama models)
-        if tokenizer is None and model_type and 'llama' in model_type.lower():
-            try:
-                from transformers import LlamaTokenizer
-                tokenizer = LlamaTokenizer.from_pretrained(
-                    model_path,
-                    trust_remote_code=True,
-                    local_files_only=True
-                )
-                logger.info("✓ Tokenizer loaded with LlamaTokenizer")
-            except Exception as e7:
-                tokenizer_errors.append(f"LlamaTokenizer: {e7}")
-        
+                else:
+                    # config=None is ignored by AutoTokenizer, so the
+                    # pre-parsed LlamaConfig rides along whenever we have one
+                    # and saves the internal config.json re-read
+                    tokenizer = AutoTokenizer.from_pretrained(
+                        model_path,
+                        config=llama_config,
+                        trust_remote_code=True,
+                        use_fast=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with AutoTokenizer (config-driven)")
+            except Exception as e_fast:
+                tokenizer_errors.append(f"config-driven load: {e_fast}")
+                logger.warning(f"⚠ Config-driven tokenizer load failed ({e_fast}) - trying recovery cascade")
+                recovery_mode = True
+
+        if recovery_mode:
+            # Strategy 1: For PreTrainedTokenizerFast, try loading directly from tokenizer.json
+            # This bypasses config.json entirely and avoids the 'dict has no attribute model_type' error
+            if tokenizer is None and tokenizer_class_name == 'PreTrainedTokenizerFast':
+                tokenizer_json_path = model_path_obj / "tokenizer.json"
+                if tokenizer_json_path.exists():
+                    try:
+                        from transformers import PreTrainedTokenizerFast
+                        tokenizer = PreTrainedTokenizerFast(
+                            tokenizer_file=str(tokenizer_json_path),
+                            bos_token="<|begin_of_text|>",
+                            eos_token="<|end_of_text|>",
+                            pad_token="<|end_of_text|>",
+                        )
+                        logger.info("✓ Tokenizer loaded directly from tokenizer.json")
+                    except Exception as e0:
+                        tokenizer_errors.append(f"PreTrainedTokenizerFast from tokenizer.json: {e0}")
+
+            # Strategy 2: Try with the pre-loaded LlamaConfig if available
+            if tokenizer is None and llama_config is not None:
+                try:
+                    tokenizer = AutoTokenizer.from_pretrained(
+                        model_path,
+                        config=llama_config,
+                        trust_remote_code=True,
+                        use_fast=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with LlamaConfig")
+                except Exception as e1:
+                    tokenizer_errors.append(f"with LlamaConfig: {e1}")
+
+            # Strategy 3: Try AutoTokenizer with use_fast=True
+            if tokenizer is None:
+                try:
+                    tokenizer = AutoTokenizer.from_pretrained(
+                        model_path,
+                        trust_remote_code=True,
+                        use_fast=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with use_fast=True")
+                except Exception as e3:
+                    tokenizer_errors.append(f"use_fast=True: {e3}")
+
+            # Strategy 4: Try with use_fast=False
+            if tokenizer is None:
+                try:
+                    tokenizer = AutoTokenizer.from_pretrained(
+                        model_path,
+                        trust_remote_code=True,
+                        use_fast=False,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with use_fast=False")
+                except Exception as e4:
+                    tokenizer_errors.append(f"use_fast=False: {e4}")
+
+            # Strategy 5: Try PreTrainedTokenizerFast.from_pretrained
+            if tokenizer is None:
+                try:
+                    from transformers import PreTrainedTokenizerFast
+                    tokenizer = PreTrainedTokenizerFast.from_pretrained(
+                        model_path,
+                        trust_remote_code=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with PreTrainedTokenizerFast.from_pretrained")
+                except Exception as e5:
+                    tokenizer_errors.append(f"PreTrainedTokenizerFast.from_pretrained: {e5}")
+
+            # Strategy 6: Try LlamaTokenizerFast (only for llama models)
+            if tokenizer is None and model_type and 'llama' in model_type.lower():
+                try:
+                    from transformers import LlamaTokenizerFast
+                    tokenizer = LlamaTokenizerFast.from_pretrained(
+                        model_path,
+                        trust_remote_code=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with LlamaTokenizerFast")
+                except Exception as e6:
+                    tokenizer_errors.append(f"LlamaTokenizerFast: {e6}")
+
+            # Strategy 7: Try LlamaTokenizer (only for llama models)
+            if tokenizer is None and model_type and 'llama' in model_type.lower():
+                try:
+                    from transformers import LlamaTokenizer
+                    tokenizer = LlamaTokenizer.from_pretrained(
+                        model_path,
+                        trust_remote_code=True,
+                        local_files_only=True
+                    )
+                    logger.info("✓ Tokenizer loaded with LlamaTokenizer")
+                except Exception as e7:
+                    tokenizer_errors.append(f"LlamaTokenizer: {e7}")
+
+        # The Rust tokenizer parallelizes list inputs - batched tokenization
+        # is an order of magnitude faster than per-text calls. Warn if we had
+        # to fall back to the pure-Python implementation.
+        if tokenizer is not None and not getattr(tokenizer, 'is_fast', False):
+            logger.warning("⚠ Slow (Python) tokenizer in use - batched tokenization will not parallelize")
+
         if tokenizer is None:
             logger.error("")
             logger.error("=" * 80)
@@ -3362,7 +4595,8 @@ def load_model(model_name: str, model_path: str):
             logger.error("=" * 80)
             raise RuntimeError(
                 f"Tokenizer loading failed for {model_path}. "
-                f"Tried 5 strategies, all failed. No silent fallback to remote models. "
+                f"All strategies failed, including the recovery cascade. "
+                f"No silent fallback to remote models. "
                 f"Check logs above for debugging details."
             )
         
@@ -3373,58 +4607,77 @@ def load_model(model_name: str, model_path: str):
             tokenizer.pad_token_id = tokenizer.eos_token_id
             logger.info("✓ Set pad_token = eos_token (required for Llama-2 tokenizers)")
         
-        start_time = time.time()
-        
-        # Load model with optimizations for multi-GPU
-        logger.info(f"Loading OneSeek-7B-Zero with chained LoRA adapters...")
-        logger.info("Loading checkpoint shards...")
-        model = AutoModelForCausalLM.from_pretrained(
-            model_path,
-            **model_kwargs
-        )
-        
+        # Join the background weight load started before the tokenizer
+        # strategies - both ran concurrently
+        model = model_future.result()
+        weights_executor.shutdown(wait=False)
+
+        # Cache the ids generate needs directly on the model - the tokenizer
+        # attribute plumbing (pad_token_id proxies through special-tokens
+        # maps) otherwise runs on every request
+        model._pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+        model._eos_id = tokenizer.eos_token_id
+
         load_time = time.time() - start_time
-        
-        # Move model to device if not using device_map
-        if not args.auto_devices:
+
+        # Verify the fused attention kernel actually took effect - a silent
+        # fall-back to eager attention costs 2-4x on prefill
+        if 'attn_implementation' in model_kwargs:
+            selected_attn = getattr(model.config, '_attn_implementation', 'unknown')
+            if selected_attn in ('flash_attention_2', 'sdpa'):
+                logger.info(f"✓ Fused attention active: {selected_attn}")
+            else:
+                logger.warning(f"⚠ Requested {model_kwargs['attn_implementation']} attention "
+                               f"but model reports '{selected_attn}' (eager is 2-4x slower on prefill)")
+
+        # Move model to device if not using device_map (DirectML/XPU path)
+        if not args.auto_devices and 'device_map' not in model_kwargs:
             model = model.to(DEVICE)
         
         # For OneSeek, load ALL DNA adapters from metadata.json
         # This uses the metadata as source of truth for which adapters to load
         if model_name.startswith('oneseek'):
-            try:
-                from peft import PeftModel
-            except ImportError:
+            if PeftModel is None:
                 logger.warning("⚠ PEFT ej installerat – kan inte ladda DNA-adapters")
                 logger.info("  Installera med: pip install peft")
-                PeftModel = None
-            
+
             if PeftModel:
                 certified_model_path = Path(ONESEEK_PATH)
                 adapters_to_load = []
-                
+                adapters_from_metadata = False
+
                 # PRIORITY 1: Read adapters from metadata.json (source of truth)
                 metadata_path = certified_model_path / "metadata.json"
-                if metadata_path.exists():
+                metadata_found = metadata_path.exists()
+                if metadata_found:
                     try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
+                        # (path, mtime) cache - dual-model init parses this
+                        # same file in find_lora_weights and per load_model
+                        # call, so reuse the parsed dict
+                        metadata = _read_json_cached(metadata_path)
+
                         adapters_list = metadata.get("adapters", [])
                         if adapters_list:
                             logger.info(f"Hittade {len(adapters_list)} DNA-adapter(s) i metadata.json")
                             
+                            # Probe with plain-str os.path joins; the Path
+                            # object is only built for the adapters we keep
+                            # (downstream uses .name)
+                            certified_str = str(certified_model_path)
                             for adapter_name in adapters_list:
                                 # Handle both old format (with lora_adapters/) and new format (just folder name)
                                 if adapter_name.startswith("lora_adapters/"):
                                     # Old format - try parent directory
-                                    adapter_path = certified_model_path.parent / adapter_name.replace("/", os.sep)
+                                    adapter_path_str = os.path.join(
+                                        os.path.dirname(certified_str), *adapter_name.split("/"))
                                 else:
                                     # New format - adapter is inside certified model directory
-                                    adapter_path = certified_model_path / adapter_name
-                                
-                                if adapter_path.is_dir() and (adapter_path / "adapter_model.safetensors").exists():
-                                    adapters_to_load.append(adapter_path)
+                                    adapter_path_str = os.path.join(certified_str, adapter_name)
+
+                                if os.path.isdir(adapter_path_str) and os.path.isfile(
+                                        os.path.join(adapter_path_str, "adapter_model.safetensors")):
+                                    adapters_to_load.append(Path(adapter_path_str))
+                                    adapters_from_metadata = True
                                     logger.info(f"  ✓ Hittade: {adapter_name}")
                                 else:
                                     logger.warning(f"  ⚠ Adapter-mapp saknas: {adapter_name}")
@@ -3435,25 +4688,95 @@ def load_model(model_name: str, model_path: str):
                 
                 # PRIORITY 2: Fallback - scan subdirectories for adapter files
                 # NOTE: This is only a fallback when metadata.json doesn't exist or has no adapters
-                # This should NOT load adapters from unrelated base models
-                if not adapters_to_load and certified_model_path.exists():
+                # This should NOT load adapters from unrelated base models.
+                # metadata.json existing implies the model directory exists,
+                # so the exists() stat only runs when metadata was missing.
+                if not adapters_to_load and (metadata_found or certified_model_path.exists()):
                     logger.warning("⚠ Ingen adapter-lista i metadata.json - använder fallback-sökning")
                     logger.info(f"Söker DNA-adapters i: {certified_model_path}")
                     logger.info("  OBS: Endast adapters som tillhör denna modell kommer laddas")
-                    
-                    for item in certified_model_path.iterdir():
-                        if item.is_dir():
+
+                    # One scandir + one listdir per subdirectory: the adapter
+                    # probe checks both marker files from a single directory
+                    # read instead of two stats per candidate
+                    with os.scandir(certified_model_path) as entries:
+                        for entry in entries:
+                            if not entry.is_dir(follow_symlinks=False):
+                                continue
+                            try:
+                                names = set(os.listdir(entry.path))
+                            except OSError:
+                                continue
                             # Check for PEFT adapter format
-                            if (item / "adapter_model.safetensors").exists() or (item / "adapter_config.json").exists():
+                            if 'adapter_model.safetensors' in names or 'adapter_config.json' in names:
                                 # Log that we found an adapter via fallback scan
-                                logger.info(f"  Hittade adapter via fallback: {item.name}")
-                                adapters_to_load.append(item)
+                                logger.info(f"  Hittade adapter via fallback: {entry.name}")
+                                adapters_to_load.append(Path(entry.path))
                 
                 if adapters_to_load:
-                    # Sort by name so newest (highest timestamp) loads last and "wins"
-                    adapters_to_load.sort(key=lambda x: x.name)
+                    # metadata.json lists adapters in canonical stacking order,
+                    # so sorting there would throw that away. Only the fallback
+                    # scan sorts by name so newest (highest timestamp) loads
+                    # last and "wins".
+                    if not adapters_from_metadata and len(adapters_to_load) > 1:
+                        adapters_to_load.sort(key=lambda x: x.name)
                     loaded_count = 0
-                    
+
+                    # Ask the OS to pull the adapter weights into the page
+                    # cache now, so the disk reads of later adapters overlap
+                    # with the CPU-side merge of earlier ones instead of
+                    # serializing behind it. fadvise(WILLNEED) where
+                    # available, a threaded head-read on Windows.
+                    def _prefetch_adapter(adapter_dir):
+                        weight_file = os.path.join(str(adapter_dir), 'adapter_model.safetensors')
+                        try:
+                            with open(weight_file, 'rb') as f:
+                                if hasattr(os, 'posix_fadvise'):
+                                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                                else:
+                                    f.read(1024 * 1024)
+                        except OSError:
+                            pass
+
+                    if len(adapters_to_load) > 1:
+                        prefetch_pool = ThreadPoolExecutor(max_workers=4)
+                        for adapter_dir in adapters_to_load:
+                            prefetch_pool.submit(_prefetch_adapter, adapter_dir)
+                        prefetch_pool.shutdown(wait=False)
+
+                    # On CUDA, issue each adapter's H2D copies on a side
+                    # stream so they overlap with default-stream work from
+                    # the previous adapter's module injection; wait_stream
+                    # orders the streams before the next adapter touches the
+                    # model. Page-cache warming is handled by the prefetch
+                    # pool above.
+                    aux_stream = torch.cuda.Stream() if DEVICE_TYPE == 'cuda' and len(adapters_to_load) > 1 else None
+
+                    def _stack_adapter(model, adapter_dir, adapter_kwargs):
+                        # Pageable->device copies bounce through an internal
+                        # pinned buffer, so on CUDA pre-load the adapter state
+                        # dict into pinned host memory and inject it via the
+                        # public PeftConfig/set_peft_model_state_dict API -
+                        # the H2D DMA then runs at full PCIe bandwidth.
+                        # Config and weights are parsed before the model is
+                        # touched, so any failure falls back to the standard
+                        # from_pretrained path cleanly.
+                        if DEVICE_TYPE == 'cuda' and not args.auto_devices:
+                            try:
+                                from safetensors.torch import load_file
+                                peft_config = PeftConfig.from_pretrained(str(adapter_dir))
+                                sd = load_file(
+                                    os.path.join(str(adapter_dir), 'adapter_model.safetensors'),
+                                    device='cpu')
+                                sd = {k: v.pin_memory() for k, v in sd.items()}
+                            except Exception as e:
+                                logger.debug(f"→ Pinned adapter preload failed: {e} - standard load")
+                            else:
+                                model = PeftModel(model, peft_config)
+                                set_peft_model_state_dict(model, sd)
+                                return model
+                        return PeftModel.from_pretrained(model, str(adapter_dir), **adapter_kwargs)
+
                     logger.info(f"Laddar {len(adapters_to_load)} DNA-adapter(s)...")
                     for adapter_dir in adapters_to_load:
                         try:
@@ -3462,7 +4785,12 @@ def load_model(model_name: str, model_path: str):
                             if args.auto_devices:
                                 adapter_kwargs['device_map'] = 'auto'
                                 adapter_kwargs['torch_dtype'] = dtype
-                            model = PeftModel.from_pretrained(model, str(adapter_dir), **adapter_kwargs)
+                            if aux_stream is not None:
+                                with torch.cuda.stream(aux_stream):
+                                    model = _stack_adapter(model, adapter_dir, adapter_kwargs)
+                                torch.cuda.current_stream().wait_stream(aux_stream)
+                            else:
+                                model = _stack_adapter(model, adapter_dir, adapter_kwargs)
                             loaded_count += 1
                         except Exception as e:
                             logger.warning(f"  ⚠ Kunde inte ladda {adapter_dir.name}: {e}")
@@ -3475,15 +4803,85 @@ def load_model(model_name: str, model_path: str):
                     logger.info(f"ℹ Ingen DNA-adapter hittad för {model_name} – kör basmodell")
                     logger.info("  Träna med: python scripts/train_identity.py")
         
+        # CUDA graph decode: record the fixed-shape single-token forward once
+        # and replay it per decode step, removing per-step Python + kernel
+        # launch overhead. Requires a static (preallocated) KV cache so tensor
+        # addresses stay stable across replays. Only worthwhile at batch=1
+        # with bounded max_length - generate falls back to eager for other shapes.
+        # Static KV cache on DirectML always (DynamicCache reallocates and
+        # copies its tensors as the sequence grows, and that allocator churn
+        # is a known DirectML overhead) and on CUDA exactly when the forward
+        # gets compiled below (graph replay needs stable tensor addresses).
+        # Eager CUDA - PEFT/quantized models without --compile, i.e. the
+        # certified DNA serving path - deliberately keeps DynamicCache:
+        # generate() rejects past_key_values alongside a configured
+        # cache_implementation, and the prefilled system-prompt prefix KV
+        # saves more there than static preallocation does. The API clamps
+        # max_length to 2048, so HF can preallocate the cache at the bound
+        # once during warmup and reuse it across requests.
+        will_compile = DEVICE_TYPE == 'cuda' and (
+            args.compile or args.cuda_graphs
+            or (not hasattr(model, 'peft_config')
+                and not args.load_in_4bit and not args.load_in_8bit)
+        )
+        if DEVICE_TYPE == 'directml' or will_compile:
+            try:
+                model.generation_config.cache_implementation = 'static'
+                model.generation_config.max_length = 2048
+                logger.info("✓ Static KV cache enabled (preallocated at max_length=2048)")
+            except Exception as e:
+                logger.warning(f"⚠ Could not enable static KV cache: {e}")
+
+        if (args.compile or args.cuda_graphs) and DEVICE_TYPE == 'cuda':
+            try:
+                model.forward = torch.compile(
+                    model.forward, mode='reduce-overhead',
+                    fullgraph=args.compile, dynamic=False
+                )
+                logger.info("✓ Compiled decode enabled (inductor reduce-overhead + static KV cache)")
+
+                # Pay the inductor compile + graph capture cost at startup
+                # instead of on the first user request: two dummy generations
+                # at the serving max_new_tokens clamp so the static cache
+                # shape real requests use is already cached
+                if args.compile and tokenizer is not None:
+                    logger.info("Warming up compiled model (2 dummy generations)...")
+                    warmup_start = time.perf_counter()
+                    warmup_inputs = tokenizer("Hej", return_tensors="pt").to(DEVICE)
+                    for _ in range(2):
+                        with torch.inference_mode():
+                            model.generate(
+                                **warmup_inputs,
+                                max_new_tokens=512,
+                                do_sample=False,
+                                pad_token_id=tokenizer.eos_token_id
+                            )
+                    logger.info(f"✓ Compile warmup done in {time.perf_counter() - warmup_start:.1f}s")
+            except Exception as e:
+                logger.warning(f"⚠ Could not enable compiled decode: {e}")
+        elif args.compile or args.cuda_graphs:
+            logger.warning("⚠ --compile/--cuda-graphs require CUDA (inductor does not target DirectML/XPU) - ignoring")
+        elif (DEVICE_TYPE == 'cuda'
+              and not hasattr(model, 'peft_config')
+              and not args.load_in_4bit and not args.load_in_8bit):
+            # Base-model-only path (no LoRA adapters stacked): there are no
+            # PEFT modules to break the graph, so partial-graph compile is
+            # safe to apply by default for the kernel fusion alone. PEFT
+            # models keep compile opt-in via --compile.
+            try:
+                model.forward = torch.compile(
+                    model.forward, mode='reduce-overhead', fullgraph=False
+                )
+                logger.info("✓ torch.compile enabled for base model (reduce-overhead, partial graph)")
+            except Exception as e:
+                logger.warning(f"⚠ torch.compile unavailable for base model: {e}")
+
         # Apply device-specific optimizations
         if DEVICE_TYPE == 'xpu':
             # Intel GPU optimization via IPEX
-            try:
-                import intel_extension_for_pytorch as ipex
+            if ipex is not None:
                 model = ipex.optimize(model)
                 logger.info(f"✓ {model_name} optimized with IPEX")
-            except ImportError:
-                pass
         elif DEVICE_TYPE == 'directml':
             # === IMPORTANT: Do NOT use .to(device) after PEFT adapters are loaded! ===
             # Using .to(device) after PeftModel.from_pretrained() breaks the PEFT internal
@@ -3496,26 +4894,40 @@ def load_model(model_name: str, model_path: str):
                 import torch_directml
                 
                 # Just verify device placement - DO NOT call .to() on PEFT models!
-                cpu_tensors = 0
-                gpu_tensors = 0
                 try:
-                    for name, param in model.named_parameters():
-                        if param.device.type == 'cpu':
-                            cpu_tensors += 1
-                            if DEBUG_MODE and cpu_tensors <= 3:
-                                logger.debug(f"→ Tensor on CPU: {name}")
-                        else:
-                            gpu_tensors += 1
-                    
-                    if gpu_tensors > 0 and cpu_tensors == 0:
-                        logger.info(f"✓ ALL {gpu_tensors} tensors on DirectML GPU!")
-                    elif gpu_tensors > cpu_tensors:
-                        logger.info(f"✓ {gpu_tensors} tensors on GPU, {cpu_tensors} on CPU (auto-offloaded)")
-                        logger.info("  This is normal with device_map='auto' - large layers may be on CPU")
+                    # any() short-circuits on the first CPU tensor, so the
+                    # common all-on-GPU case stops at one .device access
+                    # instead of walking all ~300 parameters; the full count
+                    # only runs when something actually spilled to CPU
+                    if not any(p.device.type == 'cpu' for p in model.parameters()):
+                        logger.info("✓ ALL tensors on DirectML GPU!")
                     else:
-                        logger.warning(f"⚠ {cpu_tensors} tensors on CPU, {gpu_tensors} on GPU")
-                        logger.info("  Consider enabling --auto-devices for GPU offloading")
-                        
+                        cpu_tensors = 0
+                        gpu_tensors = 0
+                        # parameters() skips building the dotted name strings;
+                        # only walk named_parameters() when we actually log names
+                        for param in model.parameters():
+                            if param.device.type == 'cpu':
+                                cpu_tensors += 1
+                            else:
+                                gpu_tensors += 1
+                        if DEBUG_MODE:
+                            logged = 0
+                            for name, param in model.named_parameters():
+                                if param.device.type == 'cpu':
+                                    logger.debug(f"→ Tensor on CPU: {name}")
+                                    logged += 1
+                                    if logged >= 3:
+                                        break
+
+                        if gpu_tensors > cpu_tensors:
+                            logger.info(f"✓ {gpu_tensors} tensors on GPU, {cpu_tensors} on CPU (auto-offloaded)")
+                            logger.info("  This is normal with device_map='auto' - large layers may be on CPU")
+                        else:
+                            logger.warning(f"⚠ {cpu_tensors} tensors on CPU, {gpu_tensors} on GPU")
+                            logger.info("  Consider enabling --auto-devices for GPU offloading")
+
+
                 except Exception as e:
                     logger.debug(f"→ Could not count tensors: {e}")
                 
@@ -3528,7 +4940,13 @@ def load_model(model_name: str, model_path: str):
         # Cache models
         models[model_name] = model
         tokenizers[model_name] = tokenizer
-        
+
+        # Cache the parameter device so move_inputs skips the model walk
+        try:
+            MODEL_DEVICE = next(model.parameters()).device
+        except StopIteration:
+            pass
+
         # Log detailed performance information
         logger.info("=" * 80)
         logger.info(f"OneSeek-7B-Zero loaded in {load_time:.1f} seconds")
@@ -3539,11 +4957,16 @@ def load_model(model_name: str, model_path: str):
         
         logger.info("OneSeek-7B-Zero is now LIVE and CONTINUOUS")
         logger.info("=" * 80)
-        logger.info(f"✓ {model_name} loaded successfully on {DEVICE_TYPE} ({dtype})")
+        # Report the dtype the loaded weights actually resolved to (a
+        # quantization config or checkpoint dtype can override the request)
+        logger.info(f"✓ {model_name} loaded successfully on {DEVICE_TYPE} ({getattr(model, 'dtype', dtype)})")
         
         return model, tokenizer
         
     except Exception as e:
+        # Don't leak the background weight load if the tokenizer side failed
+        model_future.cancel()
+        weights_executor.shutdown(wait=False)
         logger.error(f"Error loading {model_name}: {str(e)}")
         raise
 
@@ -3555,40 +4978,34 @@ async def dual_model_inference(text: str, max_length: int = 512, temperature: fl
     
     Returns combined response with metadata from both models
     """
-    import time
-    import asyncio
-    
-    async def run_single_inference(model_key: str, model, tokenizer, prompt: str):
-        """Run inference on a single model"""
-        start_time = time.time()
+    def _sync_infer(model_key: str, model, tokenizer, prompt: str):
+        """Run inference on a single model (synchronous, thread-safe)"""
+        start_time = time.perf_counter()
         
         # Tokenize input and sync to model's device
-        inputs = tokenizer(prompt, return_tensors="pt", padding=True)
-        inputs = sync_inputs_to_model_device(inputs, model)
+        inputs = tokenizer(prompt, return_tensors="pt")
+        inputs = move_inputs(inputs, model)
         
         # Use max_new_tokens instead of max_length to avoid input length issues
         max_new = min(max_length, 512)
         
         # Generate with explicit attention_mask
-        with torch.no_grad():
-            outputs = model.generate(
-                input_ids=inputs['input_ids'] if isinstance(inputs, dict) else inputs.input_ids,
-                attention_mask=inputs['attention_mask'] if isinstance(inputs, dict) else inputs.attention_mask,
-                max_new_tokens=max_new,
-                temperature=temperature,
-                top_p=top_p,
-                do_sample=True,
-                pad_token_id=tokenizer.eos_token_id
+        with torch.inference_mode():
+            outputs = _locked_generate(
+                model,
+                input_ids=inputs['input_ids'],
+                attention_mask=inputs['attention_mask'],
+                **build_generation_kwargs(max_new, temperature, top_p,
+                                          getattr(model, '_pad_id', tokenizer.eos_token_id))
             )
         
-        # Decode
-        response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        
-        # Remove the input prompt from response
-        if response.startswith(prompt):
-            response = response[len(prompt):].strip()
-        
-        latency = (time.time() - start_time) * 1000
+        # Decode only the generated tail - slicing the token tensor avoids
+        # decoding the prompt just to strip it back off as a string
+        prompt_len = inputs['input_ids'].shape[-1]
+        response = tokenizer.decode(outputs[0, prompt_len:], skip_special_tokens=True).strip()
+
+
+        latency = (time.perf_counter() - start_time) * 1000
         
         return {
             'model': model_key,
@@ -3597,18 +5014,21 @@ async def dual_model_inference(text: str, max_length: int = 512, temperature: fl
             'tokens': len(outputs[0])
         }
     
-    # Load both models if not already loaded
-    if 'oneseek-mistral' not in models:
-        logger.info("Loading Mistral-7B for dual-model inference...")
-        available_models = find_all_base_models()
-        if available_models and 'mistral' in available_models:
-            load_model('oneseek-mistral', available_models['mistral'])
-    
-    if 'oneseek-llama' not in models:
-        logger.info("Loading LLaMA-2 for dual-model inference...")
+    # Load whichever models are missing - in parallel, via worker threads:
+    # the NVMe shard reads and host-to-device copies of the two loads
+    # overlap cleanly, roughly halving the dual-path cold start. Per-model
+    # load locks keep concurrent first calls from double-loading.
+    if 'oneseek-mistral' not in models or 'oneseek-llama' not in models:
         available_models = find_all_base_models()
-        if available_models and 'llama' in available_models:
-            load_model('oneseek-llama', available_models['llama'])
+        load_tasks = []
+        if 'oneseek-mistral' not in models and available_models and 'mistral' in available_models:
+            logger.info("Loading Mistral-7B for dual-model inference...")
+            load_tasks.append(asyncio.to_thread(load_model, 'oneseek-mistral', available_models['mistral']))
+        if 'oneseek-llama' not in models and available_models and 'llama' in available_models:
+            logger.info("Loading LLaMA-2 for dual-model inference...")
+            load_tasks.append(asyncio.to_thread(load_model, 'oneseek-llama', available_models['llama']))
+        if load_tasks:
+            await asyncio.gather(*load_tasks)
     
     # Check if both models are loaded
     mistral_loaded = 'oneseek-mistral' in models
@@ -3622,39 +5042,40 @@ async def dual_model_inference(text: str, max_length: int = 512, temperature: fl
         
         # Use whichever is available
         if mistral_loaded:
-            return await run_single_inference('oneseek-mistral', models['oneseek-mistral'], 
-                                             tokenizers['oneseek-mistral'], text)
+            return await asyncio.to_thread(_sync_infer, 'oneseek-mistral', models['oneseek-mistral'],
+                                           tokenizers['oneseek-mistral'], text)
         elif llama_loaded:
-            return await run_single_inference('oneseek-llama', models['oneseek-llama'], 
-                                             tokenizers['oneseek-llama'], text)
+            return await asyncio.to_thread(_sync_infer, 'oneseek-llama', models['oneseek-llama'],
+                                           tokenizers['oneseek-llama'], text)
         else:
             raise HTTPException(status_code=500, detail="No base models available")
-    
-    # Run both models in parallel (simulated async)
+
+    # Run both models truly in parallel: generate() releases the GIL inside
+    # the accelerator kernels, so the two worker threads overlap on device
+    # and wall-clock latency is max(mistral, llama) instead of the sum
     logger.info("🔄 Dual-model inference: Mistral (fast) + LLaMA (deep)")
-    
-    # Run Mistral first (fast response)
-    mistral_result = await run_single_inference('mistral', models['oneseek-mistral'], 
-                                                 tokenizers['oneseek-mistral'], text)
+
+    mistral_result, llama_result = await asyncio.gather(
+        asyncio.to_thread(_sync_infer, 'mistral', models['oneseek-mistral'],
+                          tokenizers['oneseek-mistral'], text),
+        asyncio.to_thread(_sync_infer, 'llama', models['oneseek-llama'],
+                          tokenizers['oneseek-llama'], text),
+    )
     logger.info(f"  ✓ Mistral completed in {mistral_result['latency_ms']:.0f}ms")
-    
-    # Run LLaMA (deeper analysis)
-    llama_result = await run_single_inference('llama', models['oneseek-llama'], 
-                                               tokenizers['oneseek-llama'], text)
     logger.info(f"  ✓ LLaMA completed in {llama_result['latency_ms']:.0f}ms")
-    
+
     # Combine results - use LLaMA as primary (deeper), note Mistral's speed
     combined = {
         'response': llama_result['response'],  # Use LLaMA's deeper analysis
         'model': 'OneSeek-7B-Zero.v1.1 (Dual: Mistral+LLaMA)',
         'tokens': llama_result['tokens'],
-        'latency_ms': mistral_result['latency_ms'] + llama_result['latency_ms'],
+        'latency_ms': max(mistral_result['latency_ms'], llama_result['latency_ms']),
         'mistral_latency_ms': mistral_result['latency_ms'],
         'llama_latency_ms': llama_result['latency_ms'],
         'mistral_response': mistral_result['response'],  # Include for comparison
     }
     
-    logger.info(f"  ✓ Combined response (Mistral: {mistral_result['latency_ms']:.0f}ms + LLaMA: {llama_result['latency_ms']:.0f}ms)")
+    logger.info(f"  ✓ Combined response (Mistral: {mistral_result['latency_ms']:.0f}ms ∥ LLaMA: {llama_result['latency_ms']:.0f}ms)")
     
     return combined
 
@@ -3714,20 +5135,118 @@ async def lifespan(app: FastAPI):
     logger.info(f"Active system prompt: {prompt_preview}")
     logger.info("")
     
+    # Pre-load model + tokenizer so the first request doesn't pay the cold
+    # start (the loader overlaps the weight load with the tokenizer
+    # strategies internally; running it in a thread keeps the loop free)
+    if not args.use_vllm:
+        try:
+            model, tokenizer = await asyncio.to_thread(load_model, 'oneseek-7b-zero', ONESEEK_PATH)
+            # One tiny generation pages in weights and kernels before traffic
+            await asyncio.to_thread(
+                lambda: model.generate(
+                    **move_inputs(tokenizer("Hej", return_tensors="pt"), model),
+                    max_new_tokens=4,
+                    do_sample=False,
+                    pad_token_id=tokenizer.eos_token_id
+                )
+            )
+            logger.info("✓ Model pre-loaded and warmed up")
+
+            # Prefill the system-prompt KV prefix now so the first real
+            # request only prefills its own suffix instead of paying the
+            # full prompt prefill (no-op off CUDA or when the model runs a
+            # static KV cache, which cannot accept a handed-over prefix)
+            if DEVICE_TYPE == 'cuda' and getattr(
+                    model.generation_config, 'cache_implementation', None) is None:
+                warm_inputs = move_inputs(
+                    tokenizer(format_inference_input("Hej"), return_tensors="pt"), model)
+                warm_ids = warm_inputs['input_ids'] if isinstance(warm_inputs, dict) else warm_inputs.input_ids
+                await asyncio.to_thread(_get_prefix_kv, model, tokenizer, warm_ids)
+        except Exception as e:
+            logger.warning(f"⚠ Startup pre-load failed (will lazy-load on first request): {e}")
+
+    # Start idle-model offload loop (frees HBM from unused models)
+    offload_task = None
+    if DEVICE_TYPE == 'cuda' and MODEL_IDLE_OFFLOAD_SECONDS > 0:
+        offload_task = asyncio.create_task(_offload_idle_models())
+        logger.info(f"Idle-model offload active (threshold: {MODEL_IDLE_OFFLOAD_SECONDS}s)")
+
+    # Start the micro-batch coalescer for /infer
+    global _infer_queue
+    _infer_queue = asyncio.Queue()
+    batch_task = asyncio.create_task(_infer_batch_worker())
+    logger.info(f"Micro-batching active (max batch: {MAX_BATCH}, window: {BATCH_WAIT_MS}ms)")
+
     yield
-    
+
     # Shutdown (cleanup if needed)
+    batch_task.cancel()
+    if offload_task:
+        offload_task.cancel()
     logger.info("Shutting down ML Service...")
 
-# Initialize rate limiter (10 requests per minute per IP for /infer endpoint)
-limiter = Limiter(key_func=get_remote_address)
+class TokenBucket:
+    """
+    In-process token bucket limiter for the hot inference endpoints.
+
+    slowapi re-parses the limit string, hashes the key and takes a storage
+    lock on every request; take() here is one dict update of two floats per
+    call, and the single assignment is atomic under the GIL so no lock is
+    needed. The CRUD/admin endpoints keep slowapi (see create_system_prompt),
+    where that overhead is irrelevant.
+    """
+    __slots__ = ('rate', 'burst', 'state', '_next_prune')
+
+    PRUNE_INTERVAL = 60.0  # seconds between idle-entry sweeps
+
+    def __init__(self, rate_per_minute: int):
+        self.rate = rate_per_minute / 60.0  # refill in tokens per second
+        self.burst = float(rate_per_minute)
+        self.state = {}  # client ip -> (tokens, last_ts)
+        self._next_prune = 0.0
+
+    def take(self, key: str, now: float) -> bool:
+        if now >= self._next_prune:
+            self._prune(now)
+        tokens, last = self.state.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1.0:
+            self.state[key] = (tokens, now)
+            return False
+        self.state[key] = (tokens - 1.0, now)
+        return True
+
+    def _prune(self, now: float):
+        # Without this, state grows one entry per client IP forever. An
+        # entry idle long enough to refill to burst is indistinguishable
+        # from a fresh one, so dropping it is invisible to that client.
+        # Rebuild-and-swap keeps the single-assignment atomicity take()
+        # relies on; a concurrent take() lost to the swap costs at most
+        # one token of accounting.
+        self._next_prune = now + self.PRUNE_INTERVAL
+        idle_cutoff = self.burst / self.rate  # seconds to refill from empty
+        self.state = {key: entry for key, entry in self.state.items()
+                      if now - entry[1] < idle_cutoff}
+
+
+_infer_bucket = TokenBucket(RATE_LIMIT_PER_MINUTE)
+
+
+def _check_rate_limit(request: Request):
+    """Raise 429 when the client's bucket is empty (same budget as slowapi used)"""
+    client = request.client.host if request.client else 'unknown'
+    if not _infer_bucket.take(client, time.monotonic()):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
 # Initialize FastAPI with lifespan
 app = FastAPI(
     title="OneSeek ML Service - DNA v2 Certified",
     version="2.1.0",
     description="ML inference service with DNA v2 certified model support and rate limiting",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes responses 3-10x faster than stdlib json - measurable
+    # on short completions where encoding rivals the non-GPU request cost
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
 )
 
 # Add rate limiter to app state
@@ -3797,8 +5316,7 @@ async def root():
     
     return device_info
 
-@app.post("/infer", response_model=InferenceResponse)
-@limiter.limit(f"{RATE_LIMIT_PER_MINUTE}/minute")
+@app.post("/infer", response_model=Union[InferenceResponse, BatchInferenceResponse])
 async def infer(request: Request, inference_request: InferenceRequest):
     """
     Primary inference endpoint with rate limiting (configurable via RATE_LIMIT_PER_MINUTE).
@@ -3815,8 +5333,37 @@ async def infer(request: Request, inference_request: InferenceRequest):
     - News: Latest news from RSS feeds when news-related questions
     - Tavily Search: Real-time web search for current events/facts
     """
-    start_time = time.time()
-    
+    _check_rate_limit(request)
+    start_time = time.perf_counter()
+
+    # Multi-prompt batch: skip per-request context enrichment and fan the
+    # prompts out to the coalescer, which pads them into one generate call
+    if inference_request.texts:
+        max_new = min(inference_request.max_length, 512)
+        try:
+            if use_vllm_backend():
+                results = await asyncio.gather(*[
+                    vllm_generate(format_inference_input(t), max_new,
+                                  inference_request.temperature, inference_request.top_p)
+                    for t in inference_request.texts
+                ])
+            else:
+                results = await asyncio.gather(*[
+                    _batched_generate(format_inference_input(t), t, max_new,
+                                      inference_request.temperature, inference_request.top_p)
+                    for t in inference_request.texts
+                ])
+        except Exception as e:
+            logger.error(f"Batch inference error: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Inference failed: {str(e)}")
+
+        return BatchInferenceResponse(
+            responses=[text for text, _ in results],
+            model="OneSeek DNA v2 Certified",
+            tokens=sum(count for _, count in results),
+            latency_ms=(time.perf_counter() - start_time) * 1000
+        )
+
     # Check for Force-Svenska triggers
     force_svenska_active = check_force_svenska(inference_request.text)
     
@@ -3863,9 +5410,6 @@ async def infer(request: Request, inference_request: InferenceRequest):
             tavily_sources = format_tavily_sources(search_result)
             logger.info("✓ Tavily-svar mottaget")
     
-    # Format input with system prompt - ensures model always knows its identity
-    full_input = format_inference_input(inference_request.text)
-    
     # Build enhanced context prefix
     context_parts = []
     
@@ -3895,18 +5439,21 @@ async def infer(request: Request, inference_request: InferenceRequest):
         context_parts.insert(0, "Du pratar alltid svenska. Inga engelska ord. Inga undantag. Svara på svenska nu.")
         logger.info("🇸🇪 Force-Svenska aktiverat – svarar på svenska")
     
-    # Combine all context
-    if context_parts:
-        context_prefix = "\n".join(context_parts) + "\n\n"
-        full_input = context_prefix + full_input
-    
-    logger.debug("Injecting system prompt into inference request")
-    logger.debug(f"Force-Svenska: {'ACTIVE' if force_svenska_active else 'inactive'}")
-    logger.debug(f"Time context: {time_context[:50]}...")
-    logger.debug(f"Season: {season_context}")
-    logger.debug(f"Weather: {weather_city if weather_context else 'no'}")
-    logger.debug(f"News: {'YES' if news_context else 'no'}")
-    logger.debug(f"Tavily: {'YES' if tavily_context else 'no'}")
+    # Format input with system prompt first (stable KV prefix), then the
+    # per-request context, then the user turn
+    context_prefix = "\n".join(context_parts) + "\n\n" if context_parts else ''
+    full_input = format_inference_input(inference_request.text, context_prefix)
+
+    # Guarded so the f-strings are never built when DEBUG is off - this runs
+    # on every inference request
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Injecting system prompt into inference request")
+        logger.debug(f"Force-Svenska: {'ACTIVE' if force_svenska_active else 'inactive'}")
+        logger.debug(f"Time context: {time_context[:50]}...")
+        logger.debug(f"Season: {season_context}")
+        logger.debug(f"Weather: {weather_city if weather_context else 'no'}")
+        logger.debug(f"News: {'YES' if news_context else 'no'}")
+        logger.debug(f"Tavily: {'YES' if tavily_context else 'no'}")
     
     try:
         # Determine if we're using certified model or fallback
@@ -3930,33 +5477,32 @@ async def infer(request: Request, inference_request: InferenceRequest):
                 latency_ms=result['latency_ms']
             )
         else:
-            # Single-model inference (certified or fallback)
-            model, tokenizer = load_model('oneseek-7b-zero', ONESEEK_PATH)
-            
-            # Prepare input with system prompt and sync to model's device
-            inputs = tokenizer(full_input, return_tensors="pt", padding=True)
-            inputs = sync_inputs_to_model_device(inputs, model)
-            
             # Use max_new_tokens instead of max_length to avoid input length issues
             max_new = min(inference_request.max_length, 512)
-            
-            # Generate with explicit attention_mask
-            with torch.no_grad():
-                outputs = model.generate(
-                    input_ids=inputs['input_ids'] if isinstance(inputs, dict) else inputs.input_ids,
-                    attention_mask=inputs['attention_mask'] if isinstance(inputs, dict) else inputs.attention_mask,
-                    max_new_tokens=max_new,
-                    temperature=inference_request.temperature,
-                    top_p=inference_request.top_p,
-                    do_sample=True,
-                    pad_token_id=tokenizer.eos_token_id
+
+            if use_vllm_backend():
+                # vLLM path: continuous batching + PagedAttention; prompt
+                # stripping and device placement are handled by the engine
+                response_text, token_count = await vllm_generate(
+                    full_input,
+                    max_new,
+                    inference_request.temperature,
+                    inference_request.top_p
+                )
+            else:
+                # Single-model inference (certified or fallback) via the
+                # micro-batch coalescer: concurrent requests landing within
+                # BATCH_WAIT_MS share one padded generate call, and a lone
+                # request becomes a batch of one. Tokenization, the pinned
+                # H2D copy and response cleanup all happen in the worker
+                # thread, keeping the event loop free.
+                response_text, token_count = await _batched_generate(
+                    full_input,
+                    inference_request.text,
+                    max_new,
+                    inference_request.temperature,
+                    inference_request.top_p
                 )
-            
-            # Decode output
-            response_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Clean response using utility function
-            response_text = clean_inference_response(response_text, full_input, inference_request.text)
             
             # === APPEND SOURCES to response ===
             # Collect all sources from triggered APIs/services
@@ -3972,21 +5518,151 @@ async def infer(request: Request, inference_request: InferenceRequest):
             if sources_section:
                 response_text = response_text.rstrip() + "\n\n" + sources_section
             
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             model_name = "OneSeek DNA v2 Certified" if is_certified else "OneSeek (base model fallback)"
-            
+
             return InferenceResponse(
                 response=response_text,
                 model=model_name,
-                tokens=len(outputs[0]),
+                tokens=token_count,
                 latency_ms=latency_ms
             )
-        
+
     except Exception as e:
         logger.error(f"Inference error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Inference failed: {str(e)}")
 
+@app.post("/infer/stream")
+async def infer_stream(request: Request, inference_request: InferenceRequest):
+    """
+    Streaming inference endpoint using Server-Sent Events.
+
+    Tokens are sent to the client as they are generated instead of waiting
+    for the full completion - time-to-first-token drops from the whole
+    generation time (~15s for 512 tokens) to a single prefill + one step.
+
+    Each event is "data: {\"token\": ...}" and the stream ends with
+    "data: [DONE]". Force-Svenska and the time/season context are applied;
+    the network-bound enrichments (weather/news/Tavily/open data) stay on
+    the buffered /infer endpoint since their sources sections are appended
+    after the model output.
+    """
+    _check_rate_limit(request)
+
+    # The shared schema allows 'texts', but batch mode only exists on /infer -
+    # reject it up front instead of crashing on the None text below
+    if inference_request.texts is not None:
+        raise HTTPException(
+            status_code=422,
+            detail="'texts' batches are only supported by /infer - send a single 'text' here"
+        )
+
+    # Check for Force-Svenska triggers
+    force_svenska_active = check_force_svenska(inference_request.text)
+
+    # Always-on context: time, date & season
+    time_context = inject_time_context()
+    season_context = get_current_season()
+
+    context_parts = [f"[Aktuell tid] {time_context} {season_context}"]
+    if force_svenska_active:
+        context_parts.insert(0, "Du pratar alltid svenska. Inga engelska ord. Inga undantag. Svara på svenska nu.")
+        logger.info("🇸🇪 Force-Svenska aktiverat – svarar på svenska")
+    # System prompt first so the stable KV prefix is shared with /infer
+    full_input = format_inference_input(inference_request.text,
+                                        "\n".join(context_parts) + "\n\n")
+
+    try:
+        if use_vllm_backend():
+            # vLLM is already token-incremental - just relay the deltas
+            async def vllm_events():
+                async for delta in vllm_stream(
+                    full_input,
+                    min(inference_request.max_length, 512),
+                    inference_request.temperature,
+                    inference_request.top_p
+                ):
+                    yield f"data: {json.dumps({'token': delta}, ensure_ascii=False)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(vllm_events(), media_type="text/event-stream")
+
+        model, tokenizer = load_model('oneseek-7b-zero', ONESEEK_PATH)
+
+        inputs = await asyncio.to_thread(
+            tokenizer, full_input, return_tensors="pt"
+        )
+        inputs = move_inputs(inputs, model)
+
+        # timeout bounds each queue wait so a generate thread that died
+        # before producing a token tears the stream down (queue.Empty
+        # propagates out of the iterator) instead of hanging the client
+        # connection forever
+        streamer = TextIteratorStreamer(
+            tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=120.0
+        )
+
+        gen_kwargs = build_generation_kwargs(
+            min(inference_request.max_length, 512),
+            inference_request.temperature,
+            inference_request.top_p,
+            getattr(model, '_pad_id', tokenizer.eos_token_id)
+        )
+        gen_kwargs['input_ids'] = inputs['input_ids']
+        gen_kwargs['attention_mask'] = inputs['attention_mask']
+        gen_kwargs['streamer'] = streamer
+
+        # generate blocks until completion, so it runs in a worker thread
+        # while the streamer feeds tokens back to the event loop
+        generation_thread = threading.Thread(
+            target=_locked_generate, args=(model,), kwargs=gen_kwargs, daemon=True
+        )
+        generation_thread.start()
+
+        async def token_events():
+            loop = asyncio.get_running_loop()
+            streamer_iter = iter(streamer)
+            while True:
+                chunk = await loop.run_in_executor(None, next, streamer_iter, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    yield f"data: {json.dumps({'token': chunk}, ensure_ascii=False)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(token_events(), media_type="text/event-stream")
+
+    except Exception as e:
+        logger.error(f"Streaming inference error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Inference failed: {str(e)}")
+
+@app.post("/v1/batch/tokenize")
+async def batch_tokenize(request: Request, tokenize_request: BatchTokenizeRequest):
+    """
+    Tokenize a list of texts in one tokenizer call.
+
+    The fast (Rust) tokenizer parallelizes list inputs, so a single call
+    over N texts is far cheaper than N per-text calls. No generation - this
+    only returns token ids and counts (e.g. for client-side prompt budgeting).
+    """
+    _check_rate_limit(request)
+    try:
+        _, tokenizer = load_model('oneseek-7b-zero', ONESEEK_PATH)
+
+        encoded = await asyncio.to_thread(
+            tokenizer, tokenize_request.inputs, padding=False, add_special_tokens=True
+        )
+
+        return JSONResponse({
+            'input_ids': encoded['input_ids'],
+            'counts': [len(ids) for ids in encoded['input_ids']],
+            'tokenizer_is_fast': bool(getattr(tokenizer, 'is_fast', False))
+        })
+    except Exception as e:
+        logger.error(f"Batch tokenize error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Tokenization failed: {str(e)}")
+
 @app.post("/infer-legacy")
 async def infer_legacy(request: InferenceRequest):
     """
@@ -4029,9 +5705,16 @@ async def oneseek_inference(request: InferenceRequest):
     - News: Latest news from RSS feeds when news-related questions
     - Tavily Search: Real-time web search for current events/facts
     """
-    import time
-    start_time = time.time()
-    
+    start_time = time.perf_counter()
+
+    # The shared schema allows 'texts', but batch mode only exists on /infer -
+    # reject it up front instead of crashing on the None text below
+    if request.texts is not None:
+        raise HTTPException(
+            status_code=422,
+            detail="'texts' batches are only supported by /infer - send a single 'text' here"
+        )
+
     # Check for Force-Svenska triggers
     force_svenska_active = check_force_svenska(request.text)
     
@@ -4095,9 +5778,6 @@ async def oneseek_inference(request: InferenceRequest):
             tavily_sources = format_tavily_sources(search_result)
             logger.info("✓ Tavily-svar mottaget")
     
-    # Format input with system prompt - ensures model always knows its identity
-    full_input = format_inference_input(request.text)
-    
     # Build enhanced context prefix
     context_parts = []
     
@@ -4127,11 +5807,11 @@ async def oneseek_inference(request: InferenceRequest):
         context_parts.insert(0, "Du pratar alltid svenska. Inga engelska ord. Inga undantag. Svara på svenska nu.")
         logger.info("🇸🇪 Force-Svenska aktiverat – svarar på svenska")
     
-    # Combine all context
-    if context_parts:
-        context_prefix = "\n".join(context_parts) + "\n\n"
-        full_input = context_prefix + full_input
-    
+    # Format input with system prompt first (stable KV prefix), then the
+    # per-request context, then the user turn
+    context_prefix = "\n".join(context_parts) + "\n\n" if context_parts else ''
+    full_input = format_inference_input(request.text, context_prefix)
+
     # === DEBUG: Log inference start ===
     logger.debug("=" * 60)
     logger.debug("=== ONESEEK INFERENCE START ===")
@@ -4184,73 +5864,77 @@ async def oneseek_inference(request: InferenceRequest):
                 pass
             
             # Prepare input with system prompt and sync to model's device
+            # Tokenization runs in a thread to keep the event loop free
             logger.debug("→ Tokenizing input with system prompt...")
-            tokenize_start = time.time()
-            inputs = tokenizer(full_input, return_tensors="pt", padding=True)
-            tokenize_time = (time.time() - tokenize_start) * 1000
+            tokenize_start = time.perf_counter()
+            inputs = await asyncio.to_thread(
+                tokenizer, full_input, return_tensors="pt"
+            )
+            # Normalize BatchEncoding to a plain dict once at the tokenizer
+            # boundary - every access below is then a straight subscript
+            inputs = dict(inputs)
+            tokenize_time = (time.perf_counter() - tokenize_start) * 1000
             logger.debug(f"→ Tokenization took: {tokenize_time:.1f}ms")
             
             # === DEBUG: Log input tensor info ===
-            if hasattr(inputs, 'input_ids'):
-                logger.debug(f"→ input_ids shape: {inputs.input_ids.shape}")
-                logger.debug(f"→ input_ids device (before sync): {inputs.input_ids.device}")
-                logger.debug(f"→ First 10 tokens: {inputs.input_ids[0][:10].tolist()}")
-            elif isinstance(inputs, dict) and 'input_ids' in inputs:
+            # Token dumps only when DEBUG is actually on: .tolist() forces a
+            # blocking device->host readback (stalls the DirectML command
+            # queue), so it must not run just to build a discarded f-string
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"→ input_ids shape: {inputs['input_ids'].shape}")
                 logger.debug(f"→ input_ids device (before sync): {inputs['input_ids'].device}")
                 logger.debug(f"→ First 10 tokens: {inputs['input_ids'][0][:10].tolist()}")
             
-            # Sync to model device
+            # Sync to model device (pinned + non-blocking copy on CUDA)
             logger.debug("→ Syncing inputs to model device...")
-            inputs = sync_inputs_to_model_device(inputs, model)
+            inputs = move_inputs(inputs, model)
             
             # === DEBUG: Log post-sync device ===
-            if isinstance(inputs, dict) and 'input_ids' in inputs:
-                logger.debug(f"→ input_ids device (after sync): {inputs['input_ids'].device}")
-            elif hasattr(inputs, 'input_ids'):
-                logger.debug(f"→ input_ids device (after sync): {inputs.input_ids.device}")
+            logger.debug(f"→ input_ids device (after sync): {inputs['input_ids'].device}")
             
             # Generate with explicit attention_mask
             logger.info("→ Kallar model.generate()...")
-            generate_start = time.time()
+            generate_start = time.perf_counter()
             
-            with torch.no_grad():
+            with torch.inference_mode():
                 try:
                     # Use max_new_tokens instead of max_length to avoid input length issues
-                    input_length = inputs['input_ids'].shape[1] if isinstance(inputs, dict) else inputs.input_ids.shape[1]
+                    input_length = inputs['input_ids'].shape[1]
                     max_new = min(request.max_length, 512)  # Generate up to 512 new tokens
                     
-                    outputs = model.generate(
-                        input_ids=inputs['input_ids'] if isinstance(inputs, dict) else inputs.input_ids,
-                        attention_mask=inputs['attention_mask'] if isinstance(inputs, dict) else inputs.attention_mask,
-                        max_new_tokens=max_new,
-                        temperature=request.temperature,
-                        top_p=request.top_p,
-                        do_sample=True,
-                        pad_token_id=tokenizer.eos_token_id
+                    outputs = _locked_generate(
+                        model,
+                        input_ids=inputs['input_ids'],
+                        attention_mask=inputs['attention_mask'],
+                        **build_generation_kwargs(
+                            max_new,
+                            request.temperature,
+                            request.top_p,
+                            getattr(model, '_pad_id', tokenizer.eos_token_id)
+                        )
                     )
                 except Exception as gen_error:
                     logger.error(f"→ model.generate() FAILED: {gen_error}")
                     raise gen_error
             
-            generate_time = (time.time() - generate_start)
+            generate_time = (time.perf_counter() - generate_start)
             logger.info(f"→ Generate klar! Tog: {generate_time:.2f} sekunder")
             
             # === DEBUG: Log output info ===
-            logger.debug(f"→ Output shape: {outputs.shape}")
-            logger.debug(f"→ Output tokens: {len(outputs[0])}")
-            logger.debug(f"→ Första 10 output tokens: {outputs[0][:10].tolist()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"→ Output shape: {outputs.shape}")
+                logger.debug(f"→ Output tokens: {len(outputs[0])}")
+                logger.debug(f"→ Första 10 output tokens: {outputs[0][:10].tolist()}")
             
-            # Decode output
+            # Decode only the generated tail: slicing at the prompt width
+            # drops the echoed input at the token level, so decode covers
+            # O(|gen|) tokens and no string-level prompt stripping is needed
             logger.debug("→ Decoding output...")
-            decode_start = time.time()
-            response_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-            decode_time = (time.time() - decode_start) * 1000
+            decode_start = time.perf_counter()
+            response_text = tokenizer.decode(outputs[0, input_length:], skip_special_tokens=True).strip()
+            decode_time = (time.perf_counter() - decode_start) * 1000
             logger.debug(f"→ Decoding took: {decode_time:.1f}ms")
             
-            # Clean response using utility function
-            response_text = clean_inference_response(response_text, full_input, request.text)
-            
             # === APPEND SOURCES TO RESPONSE ===
             # Only add sources if they don't already exist in response
             if "**Källor:**" not in response_text:
@@ -4264,7 +5948,7 @@ async def oneseek_inference(request: InferenceRequest):
                 elif tavily_sources:
                     response_text += tavily_sources
             
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.perf_counter() - start_time) * 1000
             
             # === DEBUG: Log response summary ===
             logger.debug(f"→ Response length: {len(response_text)} chars")
@@ -4286,27 +5970,19 @@ async def oneseek_inference(request: InferenceRequest):
         logger.error(f"Traceback:\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/inference/llama", response_model=InferenceResponse)
-async def llama_inference(request: InferenceRequest):
-    """Generate response using LLaMA-2 7B (legacy endpoint - redirects to OneSeek)"""
-    import time
-    start_time = time.time()
-    
-    # Legacy endpoint deprecated - use /inference/oneseek instead
-    logger.warning("Legacy llama endpoint called - DEPRECATED. Use /inference/oneseek instead.")
-    raise HTTPException(
-        status_code=410,
-        detail="This legacy endpoint has been removed. Please use /inference/oneseek for all inference requests. OneSeek-7B-Zero is the unified model for all inference."
-    )
+# Legacy per-model endpoints - the mistral and llama handlers were
+# near-identical, so they share one parameterized route. Both are
+# deprecated: OneSeek-7B-Zero is the unified model for all inference.
+# Note: /inference/oneseek is registered above, so the literal route wins.
+LEGACY_MODEL_ENDPOINTS = {'mistral', 'llama'}
 
-@app.post("/inference/mistral", response_model=InferenceResponse)
-async def mistral_inference(request: InferenceRequest):
-    """Generate response using Mistral 7B (DEPRECATED - use /inference/oneseek)"""
-    import time
-    start_time = time.time()
-    
-    # Legacy endpoint deprecated - use /inference/oneseek instead
-    logger.warning("Legacy mistral endpoint called - DEPRECATED. Use /inference/oneseek instead.")
+@app.post("/inference/{model_name}", response_model=InferenceResponse)
+async def legacy_model_inference(model_name: str, request: InferenceRequest):
+    """Generate response using a legacy base model (DEPRECATED - use /inference/oneseek)"""
+    if model_name not in LEGACY_MODEL_ENDPOINTS:
+        raise HTTPException(status_code=404, detail=f"Unknown inference endpoint: {model_name}")
+
+    logger.warning(f"Legacy {model_name} endpoint called - DEPRECATED. Use /inference/oneseek instead.")
     raise HTTPException(
         status_code=410,
         detail="This legacy endpoint has been removed. Please use /inference/oneseek for all inference requests. OneSeek-7B-Zero is the unified model for all inference."
@@ -4335,11 +6011,19 @@ if __name__ == "__main__":
     
     port = int(os.getenv('ML_SERVICE_PORT', '5000'))
     host = "0.0.0.0" if args.listen else "127.0.0.1"
-    
+
+    # IMPORTANT: workers is pinned to 1. Each uvicorn worker is a separate
+    # process with its own model cache - N workers would load N copies of a
+    # ~14 GB model and OOM the GPU. Concurrency comes from the async event
+    # loop sharing the single in-process model, not from process workers.
     uvicorn.run(
         app,
         host=host,
         port=port,
+        workers=1,
         log_level="info",
+        # uvloop roughly doubles request throughput vs the selector loop;
+        # "auto" falls back cleanly where it is not installed (e.g. Windows)
+        loop="uvloop" if uvloop is not None else "auto",
         timeout_keep_alive=args.timeout_keep_alive
     )
@@ -0,0 +1,68 @@
+"""
+Tests for the inference hot path: prefix KV cache handover and batching
+
+Note: These tests require torch to be installed since they import from server.py.
+In CI environments without GPU/torch, these tests will be skipped.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add ml_service to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ml_service'))
+
+# Skip all tests if torch is not available
+torch_available = False
+try:
+    import torch
+    torch_available = True
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.skipif(not torch_available, reason="torch not installed")
+
+
+class TestPrefixKVCache:
+    """Test when the system-prompt prefix KV cache may be handed to generate()"""
+
+    def test_skipped_when_static_cache_configured(self):
+        """Regression: generate() rejects past_key_values alongside a
+        configured cache_implementation, so the handover must be skipped"""
+        import server
+        from server import _get_prefix_kv
+
+        model = Mock()
+        model.generation_config.cache_implementation = 'static'
+
+        with patch.object(server, 'DEVICE_TYPE', 'cuda'):
+            assert _get_prefix_kv(model, Mock(), Mock()) is None
+
+    def test_skipped_off_cuda(self):
+        """The prefix cache is a CUDA-only optimization"""
+        import server
+        from server import _get_prefix_kv
+
+        model = Mock()
+        model.generation_config.cache_implementation = None
+
+        for device_type in ('directml', 'xpu', 'cpu'):
+            with patch.object(server, 'DEVICE_TYPE', device_type):
+                assert _get_prefix_kv(model, Mock(), Mock()) is None
+
+    def test_model_without_generation_config(self):
+        """A model missing generation_config must not crash the check"""
+        import server
+        from server import _get_prefix_kv
+
+        model = Mock(spec=[])  # no generation_config attribute
+
+        with patch.object(server, 'DEVICE_TYPE', 'cuda'):
+            # Falls through to the real cache path, which fails safe to None
+            # on the mock model instead of raising
+            assert _get_prefix_kv(model, Mock(), Mock()) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
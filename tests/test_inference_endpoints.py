@@ -0,0 +1,158 @@
+"""
+Tests for the inference endpoints: streaming, multi-prompt batching and
+batched tokenization
+
+Note: These tests require torch to be installed since they import from server.py.
+In CI environments without GPU/torch, these tests will be skipped.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add ml_service to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'ml_service'))
+
+# Skip all tests if torch is not available
+torch_available = False
+try:
+    import torch
+    torch_available = True
+except ImportError:
+    pass
+
+pytestmark = pytest.mark.skipif(not torch_available, reason="torch not installed")
+
+
+@pytest.fixture
+def client():
+    """Create test client"""
+    from server import app
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+
+class TestTextsValidation:
+    """Test the multi-prompt 'texts' field on InferenceRequest"""
+
+    def test_texts_accepted(self):
+        """Test a valid multi-prompt request"""
+        from server import InferenceRequest
+
+        request = InferenceRequest(texts=["Hej", "Hallå"])
+        assert request.texts == ["Hej", "Hallå"]
+        assert request.text is None
+
+    def test_text_and_texts_rejected(self):
+        """Test that providing both text and texts is rejected"""
+        from server import InferenceRequest
+        from pydantic import ValidationError
+
+        with pytest.raises(ValidationError):
+            InferenceRequest(text="Hej", texts=["Hallå"])
+
+    def test_neither_text_nor_texts_rejected(self):
+        """Test that omitting both text and texts is rejected"""
+        from server import InferenceRequest
+        from pydantic import ValidationError
+
+        with pytest.raises(ValidationError):
+            InferenceRequest()
+
+    def test_empty_batch_item_rejected(self):
+        """Test that an empty string inside texts is rejected"""
+        from server import InferenceRequest
+        from pydantic import ValidationError
+
+        with pytest.raises(ValidationError):
+            InferenceRequest(texts=["Hej", "   "])
+
+    def test_texts_sanitization(self):
+        """Test that null bytes are removed from batched texts"""
+        from server import InferenceRequest
+
+        request = InferenceRequest(texts=["test\x00with\x00nulls"])
+        assert request.texts == ["testwithnulls"]
+
+
+class TestTextsBatchEndpoint:
+    """Test the multi-prompt batch branch of /infer"""
+
+    def test_infer_texts_response_shape(self, client, tmp_path):
+        """Test that a texts batch returns the batch response schema"""
+        async def fake_batched(full_input, user_text, max_new_tokens,
+                               temperature, top_p):
+            return f"svar: {user_text}", 7
+
+        with patch('server.SYSTEM_PROMPTS_DIR', tmp_path), \
+             patch('server.use_vllm_backend', return_value=False), \
+             patch('server._batched_generate', new=fake_batched):
+            response = client.post("/infer", json={"texts": ["Hej", "Hallå"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["responses"] == ["svar: Hej", "svar: Hallå"]
+        assert data["tokens"] == 14
+        assert "latency_ms" in data
+
+    def test_oneseek_rejects_texts(self, client):
+        """Test that /inference/oneseek rejects a texts batch with 422"""
+        response = client.post("/inference/oneseek", json={"texts": ["Hej"]})
+        assert response.status_code == 422
+
+    def test_stream_rejects_texts(self, client):
+        """Test that /infer/stream rejects a texts batch with 422"""
+        response = client.post("/infer/stream", json={"texts": ["Hej"]})
+        assert response.status_code == 422
+
+
+class TestStreamingEndpoint:
+    """Test the /infer/stream SSE endpoint"""
+
+    def test_stream_relays_tokens(self, client, tmp_path):
+        """Test that generated deltas arrive as SSE events ending in [DONE]"""
+        async def fake_stream(full_input, max_new_tokens, temperature, top_p):
+            for delta in ["Hej", " där"]:
+                yield delta
+
+        with patch('server.SYSTEM_PROMPTS_DIR', tmp_path), \
+             patch('server.use_vllm_backend', return_value=True), \
+             patch('server.vllm_stream', new=fake_stream):
+            response = client.post("/infer/stream", json={"text": "Hej"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert 'data: {"token": "Hej"}' in response.text
+        assert "data: [DONE]" in response.text
+
+
+class TestBatchTokenizeEndpoint:
+    """Test the /v1/batch/tokenize endpoint"""
+
+    def test_batch_tokenize_counts(self, client):
+        """Test that ids and per-text counts are returned"""
+        tokenizer = MagicMock()
+        tokenizer.return_value = {'input_ids': [[1, 2], [1, 2, 3]]}
+        tokenizer.is_fast = True
+
+        with patch('server.load_model', return_value=(None, tokenizer)):
+            response = client.post(
+                "/v1/batch/tokenize",
+                json={"inputs": ["Hej", "Hej då"]}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["input_ids"] == [[1, 2], [1, 2, 3]]
+        assert data["counts"] == [2, 3]
+        assert data["tokenizer_is_fast"] is True
+
+    def test_batch_tokenize_empty_inputs_rejected(self, client):
+        """Test that an empty inputs list is rejected"""
+        response = client.post("/v1/batch/tokenize", json={"inputs": []})
+        assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
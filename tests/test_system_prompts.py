@@ -215,6 +215,48 @@ class TestActivePrompt:
             result = get_active_system_prompt()
             assert result == "I am the active prompt"
 
+    def test_pointer_file_resolves_active_prompt(self, tmp_path):
+        """Test that the _active.txt pointer resolves the active prompt directly"""
+        from server import SystemPrompt, save_system_prompt, get_active_system_prompt, _write_active_pointer, ACTIVE_POINTER_NAME
+
+        with patch('server.SYSTEM_PROMPTS_DIR', tmp_path):
+            prompt = SystemPrompt(
+                id="pointed",
+                name="Pointed Prompt",
+                content="Resolved via pointer",
+                is_active=True
+            )
+            save_system_prompt(prompt)
+            _write_active_pointer("pointed")
+
+            assert (tmp_path / ACTIVE_POINTER_NAME).exists()
+            assert get_active_system_prompt() == "Resolved via pointer"
+
+    def test_empty_pointer_returns_default(self, tmp_path):
+        """Test that an empty pointer short-circuits to the default prompt"""
+        from server import get_active_system_prompt, _write_active_pointer, DEFAULT_SYSTEM_PROMPT
+
+        with patch('server.SYSTEM_PROMPTS_DIR', tmp_path):
+            _write_active_pointer("")
+
+            assert get_active_system_prompt() == DEFAULT_SYSTEM_PROMPT
+
+    def test_stale_pointer_falls_back_to_scan(self, tmp_path):
+        """Test that a pointer to a deleted prompt falls back to the full scan"""
+        from server import SystemPrompt, save_system_prompt, get_active_system_prompt, _write_active_pointer
+
+        with patch('server.SYSTEM_PROMPTS_DIR', tmp_path):
+            prompt = SystemPrompt(
+                id="scanned",
+                name="Scanned Prompt",
+                content="Found by scan",
+                is_active=True
+            )
+            save_system_prompt(prompt)
+            _write_active_pointer("deleted-id")
+
+            assert get_active_system_prompt() == "Found by scan"
+
 
 class TestSystemPromptEndpoints:
     """Test FastAPI endpoints for system prompts"""